@@ -6,10 +6,18 @@ and Splunk to use file-based persistence, allowing created resources
 to persist across CLI invocations.
 
 State files: /tmp/mock_state_{platform}.json (reset per scenario)
+Mutation logs: /tmp/mock_state_{platform}.log (replayed over the snapshot)
+
+Mutations only mark the changed items dirty; they are appended to the log
+once when the process exits (or when flush_now() is called), so each CLI
+invocation writes only what it changed. Items whose content is unchanged
+since the last write (e.g. a retried update) are skipped. The log is
+compacted back into the snapshot after LOG_COMPACT_LINES entries.
 
 Environment variables:
     SKILL_TEST_PLATFORM: Platform(s) being tested (confluence|jira|splunk|all)
-    {PLATFORM}_MOCK_MODE: Enable mock mode for specific platform (true/false)
+    {PLATFORM}_MOCK_MODE: Enable mock mode for specific platform (true/false);
+        the import hook is only installed when at least one is enabled
     MOCK_STATE_FILE: Override default state file path
 
 Supported platforms and their mock modules:
@@ -18,11 +26,19 @@ Supported platforms and their mock modules:
     - Splunk: splunk_as.mock.base.MockSplunkClientBase (if available)
 """
 
-import json
+from __future__ import annotations
+
+import atexit
 import os
 import sys
-from pathlib import Path
-from typing import Any
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Iterable
+
+# json, copy and pathlib are imported inside the functions that need them: this
+# module runs at startup of every Python process in the container, most of
+# which never touch a mock client.
+if TYPE_CHECKING:
+    from pathlib import Path
 
 # =============================================================================
 # Configuration
@@ -30,14 +46,21 @@ from typing import Any
 
 # Platform detection from environment
 PLATFORM = os.environ.get("SKILL_TEST_PLATFORM", "").lower()
-PLATFORMS_UNDER_TEST = (
-    ["confluence", "jira", "splunk"] if PLATFORM in ("all", "cross-platform")
-    else [PLATFORM] if PLATFORM else []
+PLATFORMS_UNDER_TEST: tuple[str, ...] = (
+    ("confluence", "jira", "splunk") if PLATFORM in ("all", "cross-platform")
+    else (PLATFORM,) if PLATFORM else ()
 )
 
 # Default state file path (can be overridden)
+@lru_cache(maxsize=8)
 def get_state_file(platform: str) -> Path:
-    """Get the mock state file path for a platform."""
+    """Get the mock state file path for a platform.
+
+    Cached: MOCK_STATE_FILE is read once per platform. Callers that change
+    it at runtime must call get_state_file.cache_clear().
+    """
+    from pathlib import Path
+
     override = os.environ.get("MOCK_STATE_FILE")
     if override:
         return Path(override)
@@ -63,126 +86,277 @@ CONFLUENCE_SEED_IDS = {
 # Splunk typically doesn't have seed data that needs exclusion
 SPLUNK_SEED_IDS: set[str] = set()
 
+# Seed keys that should never be persisted, per platform
+_EMPTY: frozenset[str] = frozenset()
+_SEED_EXCLUSIONS: dict[str, frozenset[str]] = {
+    "jira": frozenset(JIRA_SEED_KEYS),
+    "confluence": frozenset(CONFLUENCE_SEED_IDS),
+    "splunk": frozenset(SPLUNK_SEED_IDS),
+}
+
 
 # =============================================================================
 # State Persistence Functions
 # =============================================================================
 
+# Compact the mutation log into the snapshot once it grows past this size
+LOG_COMPACT_LINES = 1000
+
+# Log entries written per platform since the last snapshot
+_LOG_LINES: dict[str, int] = {}
+
+# Loaded state per platform: (data, next_id). Kept in step with every log
+# append (compaction drops it) so that constructing more clients does not
+# re-read and re-parse the files. Holds private copies; each load hands out
+# a fresh deep copy so clients never share item objects with the cache or
+# each other.
+_LOAD_CACHE: dict[str, tuple[dict, int]] = {}
+
+# CRC32 of the last snapshot payload per platform, and of each item's JSON
+# as last written, so no-op mutations cause no disk writes
+_LAST_HASH: dict[str, int] = {}
+_ITEM_HASHES: dict[str, dict[Any, int]] = {}
+
+
+def get_log_file(platform: str) -> Path:
+    """Get the append-only mutation log path for a platform."""
+    return get_state_file(platform).with_suffix(".log")
+
+
 def _save_state(platform: str, data: dict, next_id: int) -> None:
-    """Save mock state to file for a platform."""
-    # Check if mock mode is enabled for this platform
-    mock_env_var = f"{platform.upper()}_MOCK_MODE"
-    if os.environ.get(mock_env_var, "").lower() != "true":
-        return
+    """Write a full snapshot of mock state and discard the mutation log."""
+    import json
+    import zlib
 
-    # Get seed exclusions for this platform
-    seed_exclusions = {
-        "jira": JIRA_SEED_KEYS,
-        "confluence": CONFLUENCE_SEED_IDS,
-        "splunk": SPLUNK_SEED_IDS,
-    }.get(platform, set())
+    # Only save non-seed items; platforms without seed data save as-is
+    seed_exclusions = _SEED_EXCLUSIONS.get(platform, _EMPTY)
+    if seed_exclusions:
+        filtered = {key: item for key, item in data.items() if key not in seed_exclusions}
+    else:
+        filtered = data
 
     state: dict[str, Any] = {
         "next_id": next_id,
-        "data": {},
+        "data": filtered,
     }
-
-    # Only save non-seed items
-    for key, item in data.items():
-        if key not in seed_exclusions:
-            state["data"][key] = item
+    # Rare (compaction only): let the next load re-read what was written
+    # rather than copying the whole store into the cache here
+    _LOAD_CACHE.pop(platform, None)
 
     try:
         state_file = get_state_file(platform)
-        state_file.write_text(json.dumps(state, indent=2, default=str))
+        if os.environ.get("MOCK_VERBOSE", "").lower() == "true":
+            payload = json.dumps(state, indent=2, default=str)
+        else:
+            payload = json.dumps(state, separators=(",", ":"), default=str)
+        raw = payload.encode()
+        payload_hash = zlib.crc32(raw)
+        if _LAST_HASH.get(platform) != payload_hash:
+            # Write to a sibling temp file and rename so readers never see a
+            # partial file. No fsync: this is ephemeral mock data under /tmp.
+            tmp_file = state_file.with_name(state_file.name + ".tmp")
+            tmp_file.write_bytes(raw)
+            os.replace(tmp_file, state_file)
+            # Only a completed rename makes the hash true of the file
+            _LAST_HASH[platform] = payload_hash
+        # The snapshot now contains everything the log recorded
+        get_log_file(platform).unlink(missing_ok=True)
+        _LOG_LINES[platform] = 0
     except Exception:
         pass  # Silently fail - don't break CLI operations
 
 
-def _load_state(platform: str) -> tuple[dict, int]:
-    """Load mock state from file. Returns (data_dict, next_id)."""
-    state_file = get_state_file(platform)
-    if not state_file.exists():
-        return {}, 100
+def _append_changes(platform: str, data: dict, next_id: int, keys: Iterable) -> None:
+    """Append changed items to the mutation log, compacting it when large.
+
+    Each line is {"k": key, "v": item, "next_id": n}; a line without "v"
+    records a deletion.
+    """
+    import json
+    import zlib
+
+    seed_exclusions = _SEED_EXCLUSIONS.get(platform, _EMPTY)
+    cached = _LOAD_CACHE.get(platform)
+    if cached is not None:
+        _LOAD_CACHE[platform] = (cached[0], next_id)
+    hashes = _ITEM_HASHES.setdefault(platform, {})
+
+    lines = []
+    for key in keys:
+        if key in seed_exclusions:
+            continue
+        prefix = f'{{"k":{json.dumps(key)},"next_id":{json.dumps(next_id)}'
+        if key in data:
+            value = json.dumps(data[key], separators=(",", ":"), default=str)
+            value_hash = zlib.crc32(value.encode())
+            if hashes.get(key) == value_hash:
+                continue  # Same content as last written
+            hashes[key] = value_hash
+            if cached is not None:
+                # Decode what was written: a private copy of just this entry
+                cached[0][key] = json.loads(value)
+            lines.append(f'{prefix},"v":{value}}}\n')
+        else:
+            hashes.pop(key, None)
+            if cached is not None:
+                cached[0].pop(key, None)
+            lines.append(prefix + "}\n")
+    if not lines:
+        return
 
     try:
-        state = json.loads(state_file.read_text())
-        return state.get("data", {}), state.get("next_id", 100)
+        with open(get_log_file(platform), "a") as f:
+            f.writelines(lines)
     except Exception:
-        return {}, 100
+        return  # Silently fail - don't break CLI operations
 
+    # Compact after appending so a crash mid-compaction can only replay
+    # entries that already match the snapshot
+    count = _LOG_LINES.get(platform, 0) + len(lines)
+    _LOG_LINES[platform] = count
+    if count > LOG_COMPACT_LINES:
+        _save_state(platform, data, next_id)
 
-# =============================================================================
-# Platform-Specific Patchers
-# =============================================================================
 
-def _wrap_with_persistence(platform: str, data_attr: str, next_id_attr: str):
-    """Create a wrapper that saves state after method execution."""
-    def decorator(original_method):
-        def wrapper(self, *args, **kwargs):
-            result = original_method(self, *args, **kwargs)
-            _save_state(
-                platform,
-                getattr(self, data_attr),
-                getattr(self, next_id_attr),
-            )
-            return result
-        return wrapper
-    return decorator
+# Pending saves by platform: (client, data_attr, next_id_attr, changed_keys),
+# with changed_keys a dict used as an insertion-ordered set
+_DIRTY: dict[str, tuple[Any, str, str, dict]] = {}
 
 
-def _patch_jira_mock_client(cls) -> None:
-    """Patch MockJiraClientBase for file-based persistence."""
-    if getattr(cls, "_mock_persistence_patched", False):
+def _flush(platform: str) -> None:
+    """Write pending state for a platform, if any."""
+    pending = _DIRTY.pop(platform, None)
+    if pending is None:
         return
 
-    original_init = cls.__init__
+    client, data_attr, next_id_attr, keys = pending
+    _append_changes(platform, getattr(client, data_attr), getattr(client, next_id_attr, 100), keys)
 
-    def patched_init(self, *args, **kwargs):
-        original_init(self, *args, **kwargs)
-        persisted_data, next_id = _load_state("jira")
-        if persisted_data:
-            self._issues.update(persisted_data)
-            self._next_issue_id = max(self._next_issue_id, next_id)
 
-    cls.__init__ = patched_init
+def flush_now() -> None:
+    """Write all pending mock state to disk."""
+    for platform in list(_DIRTY):
+        _flush(platform)
 
-    # Wrap mutation methods
-    wrapper = _wrap_with_persistence("jira", "_issues", "_next_issue_id")
-    for method_name in ("create_issue", "update_issue", "transition_issue", "assign_issue"):
-        if hasattr(cls, method_name):
-            setattr(cls, method_name, wrapper(getattr(cls, method_name)))
 
-    cls._mock_persistence_patched = True
+def _load_state(platform: str) -> tuple[dict, int]:
+    """Load mock state from snapshot plus log. Returns (data_dict, next_id)."""
+    import json
+    from copy import deepcopy
 
+    # Clients created later in the same process must see pending mutations
+    _flush(platform)
 
-def _patch_confluence_mock_client(cls) -> None:
-    """Patch MockConfluenceClientBase for file-based persistence."""
-    if getattr(cls, "_mock_persistence_patched", False):
-        return
+    cached = _LOAD_CACHE.get(platform)
+    if cached is not None:
+        return deepcopy(cached[0]), cached[1]
 
-    original_init = cls.__init__
+    data: dict = {}
+    next_id = 100
 
-    def patched_init(self, *args, **kwargs):
-        original_init(self, *args, **kwargs)
-        persisted_data, next_id = _load_state("confluence")
-        if persisted_data:
-            self._pages.update(persisted_data)
-            self._next_page_id = max(self._next_page_id, next_id)
+    # Open directly rather than stat first; json.loads takes the raw bytes
+    try:
+        with open(get_state_file(platform), "rb") as f:
+            raw = f.read()
+    except OSError:
+        raw = b""
+    # A snapshot deleted from outside must not be mistaken for up to date
+    _LAST_HASH.pop(platform, None)
+    if raw:
+        try:
+            state = json.loads(raw)
+            data, next_id = state.get("data", {}), state.get("next_id", 100)
+        except (ValueError, AttributeError):
+            pass
+        else:
+            import zlib
+
+            _LAST_HASH[platform] = zlib.crc32(raw)
+
+    # Replay mutations recorded since the snapshot; a torn final line from
+    # an interrupted append simply ends the replay
+    lines = 0
+    try:
+        with open(get_log_file(platform), "rb") as f:
+            for line in f:
+                entry = json.loads(line)
+                if "v" in entry:
+                    data[entry["k"]] = entry["v"]
+                else:
+                    data.pop(entry["k"], None)
+                next_id = max(next_id, entry.get("next_id", next_id))
+                lines += 1
+    except Exception:
+        pass  # No log yet, or a torn line
+    _LOG_LINES[platform] = lines
 
-    cls.__init__ = patched_init
+    _LOAD_CACHE[platform] = (deepcopy(data), next_id)
+    return data, next_id
 
-    # Wrap mutation methods
-    wrapper = _wrap_with_persistence("confluence", "_pages", "_next_page_id")
-    for method_name in ("create_page", "update_page", "delete_page", "move_page"):
-        if hasattr(cls, method_name):
-            setattr(cls, method_name, wrapper(getattr(cls, method_name)))
 
-    cls._mock_persistence_patched = True
+def invalidate_state(platform: str) -> None:
+    """Drop cached state so the next client re-reads the state files.
+
+    Only needed if another process may have changed them meanwhile.
+    """
+    _LOAD_CACHE.pop(platform, None)
+    _LAST_HASH.pop(platform, None)
+    _ITEM_HASHES.pop(platform, None)
+
+
+# =============================================================================
+# Mock Client Patcher
+# =============================================================================
+
+_MISSING = object()
+
+
+def _key_args(data: dict, args: tuple, kwargs: dict) -> list:
+    """Get the call arguments that name existing items in data."""
+    return [
+        arg for arg in (*args, *kwargs.values())
+        if isinstance(arg, (str, int)) and arg in data
+    ]
+
+
+def _wrap_with_persistence(platform: str, data_attr: str, next_id_attr: str):
+    """Create a wrapper that records which items a method changed."""
+    def decorator(original_method):
+        def wrapper(self, *args, **kwargs):
+            data = getattr(self, data_attr, None)
+            if data is None or not getattr(self, "_mock_persistence_enabled", False):
+                return original_method(self, *args, **kwargs)
+
+            # Items the call names by key may be edited in place; anything
+            # added, removed or replaced shows up comparing keys and object
+            # identity. Nothing is serialized until the dirty keys are flushed.
+            named = _key_args(data, args, kwargs)
+            before = data.copy()
+            result = original_method(self, *args, **kwargs)
+            data = getattr(self, data_attr)
+            # Dict as an ordered set: additions replay in insertion order
+            changed = dict.fromkeys(
+                key for key, item in data.items() if before.get(key, _MISSING) is not item
+            )
+            changed.update(dict.fromkeys(key for key in before if key not in data))
+            changed.update(dict.fromkeys(named))
+
+            pending = _DIRTY.get(platform)
+            if pending is not None and pending[0] is self:
+                pending[3].update(changed)
+            else:
+                # Another client has pending changes; write them first
+                _flush(platform)
+                _DIRTY[platform] = (self, data_attr, next_id_attr, changed)
+            return result
+        return wrapper
+    return decorator
 
 
-def _patch_splunk_mock_client(cls) -> None:
-    """Patch MockSplunkClientBase for file-based persistence."""
+def _patch_mock_client(
+    cls, platform: str, data_attr: str, next_id_attr: str, mutators: tuple[str, ...]
+) -> None:
+    """Patch a mock client base class for file-based persistence."""
     if getattr(cls, "_mock_persistence_patched", False):
         return
 
@@ -190,19 +364,24 @@ def _patch_splunk_mock_client(cls) -> None:
 
     def patched_init(self, *args, **kwargs):
         original_init(self, *args, **kwargs)
-        persisted_data, next_id = _load_state("splunk")
+        data = getattr(self, data_attr, None)
+        if data is None:
+            return
+        persisted_data, next_id = _load_state(platform)
         if persisted_data:
-            # Splunk mock structure may differ - adapt as needed
-            if hasattr(self, "_saved_searches"):
-                self._saved_searches.update(persisted_data)
-            elif hasattr(self, "_jobs"):
-                self._jobs.update(persisted_data)
+            data.update(persisted_data)
+            if hasattr(self, next_id_attr):
+                setattr(self, next_id_attr, max(getattr(self, next_id_attr), next_id))
 
     cls.__init__ = patched_init
 
-    # Splunk mutation methods (adapt based on actual mock implementation)
-    wrapper = _wrap_with_persistence("splunk", "_saved_searches", "_next_search_id")
-    for method_name in ("create_saved_search", "update_saved_search", "delete_saved_search"):
+    # Env vars don't change mid-process, so resolve the gate once here
+    mock_env_var = f"{platform.upper()}_MOCK_MODE"
+    cls._mock_persistence_enabled = os.environ.get(mock_env_var, "").lower() == "true"
+
+    # Wrap mutation methods
+    wrapper = _wrap_with_persistence(platform, data_attr, next_id_attr)
+    for method_name in mutators:
         if hasattr(cls, method_name):
             setattr(cls, method_name, wrapper(getattr(cls, method_name)))
 
@@ -213,75 +392,105 @@ def _patch_splunk_mock_client(cls) -> None:
 # Import Hook
 # =============================================================================
 
-# Map of module names to their patching functions and class names
-MOCK_MODULE_CONFIG = {
+# Map of module names to the mock client class and how to persist it
+MOCK_MODULE_CONFIG: dict[str, dict[str, Any]] = {
     "jira_as.mock.base": {
         "class_name": "MockJiraClientBase",
-        "patcher": _patch_jira_mock_client,
         "platform": "jira",
+        "data_attr": "_issues",
+        "next_id_attr": "_next_issue_id",
+        "mutators": ("create_issue", "update_issue", "transition_issue", "assign_issue"),
     },
     "confluence_as.mock.base": {
         "class_name": "MockConfluenceClientBase",
-        "patcher": _patch_confluence_mock_client,
         "platform": "confluence",
+        "data_attr": "_pages",
+        "next_id_attr": "_next_page_id",
+        "mutators": ("create_page", "update_page", "delete_page", "move_page"),
     },
     "splunk_as.mock.base": {
+        # Splunk mock structure may differ - adapt as needed
         "class_name": "MockSplunkClientBase",
-        "patcher": _patch_splunk_mock_client,
         "platform": "splunk",
+        "data_attr": "_saved_searches",
+        "next_id_attr": "_next_search_id",
+        "mutators": ("create_saved_search", "update_saved_search", "delete_saved_search"),
     },
 }
 
+# Checked by find_spec on every import, so keep the early reject cheap
+_MOCK_MODULES: frozenset[str] = frozenset(MOCK_MODULE_CONFIG)
 
-class MockPersistenceImportHook:
-    """Import hook that patches mock clients when they're imported."""
 
-    def find_module(self, fullname: str, path: Any = None) -> "MockPersistenceImportHook | None":
-        """Return self if this is a module we want to patch."""
-        if fullname in MOCK_MODULE_CONFIG:
-            return self
-        return None
+class _PatchingLoader:
+    """Loader wrapper that applies persistence patches once a module executes."""
 
-    def load_module(self, fullname: str) -> Any:
-        """Load the module and apply persistence patches."""
-        config = MOCK_MODULE_CONFIG.get(fullname)
-        if not config:
-            return None
+    def __init__(self, loader: Any, config: dict[str, Any]) -> None:
+        self._loader = loader
+        self._config = config
 
-        # Check if already loaded
-        if fullname in sys.modules:
-            module = sys.modules[fullname]
-            cls = getattr(module, config["class_name"], None)
-            if cls and not getattr(cls, "_mock_persistence_patched", False):
-                config["patcher"](cls)
-            return module
+    def create_module(self, spec: Any) -> Any:
+        return self._loader.create_module(spec)
 
-        # Remove ourselves temporarily to avoid recursion
-        sys.meta_path.remove(self)
-        try:
-            import importlib
-            module = importlib.import_module(fullname)
-            sys.modules[fullname] = module
+    def exec_module(self, module: Any) -> None:
+        self._loader.exec_module(module)
+        cls = getattr(module, self._config["class_name"], None)
+        if cls:
+            config = self._config
+            _patch_mock_client(
+                cls,
+                config["platform"],
+                config["data_attr"],
+                config["next_id_attr"],
+                config["mutators"],
+            )
 
-            # Patch the class
-            cls = getattr(module, config["class_name"], None)
-            if cls:
-                config["patcher"](cls)
+    def __getattr__(self, name: str) -> Any:
+        # Source and resource access goes to the real loader
+        return getattr(self._loader, name)
 
-            return module
-        finally:
-            # Re-add ourselves
-            sys.meta_path.insert(0, self)
+
+class MockPersistenceImportHook:
+    """Meta path finder that patches mock clients when they're imported."""
+
+    def find_spec(self, fullname: str, path: Any = None, target: Any = None) -> Any:
+        """Return a patching spec if this is a module we want to patch."""
+        if fullname not in _MOCK_MODULES:
+            return None
+        config = MOCK_MODULE_CONFIG[fullname]
+
+        # Ask the remaining finders for the real spec. Skipping ourselves
+        # avoids recursion without mutating sys.meta_path.
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None:
+                    spec.loader = _PatchingLoader(spec.loader, config)
+                return spec
+        return None
 
 
 # =============================================================================
 # Initialization
 # =============================================================================
 
-# Install the import hook
-sys.meta_path.insert(0, MockPersistenceImportHook())  # type: ignore[arg-type]
+# Only install the hook when some platform runs in mock mode; otherwise it
+# would be consulted on every import for nothing
+MOCK_MODE_ENABLED = any(
+    os.environ.get(f"{platform.upper()}_MOCK_MODE", "").lower() == "true"
+    for platform in ("jira", "confluence", "splunk")
+)
+
+if MOCK_MODE_ENABLED:
+    # Install the import hook
+    sys.meta_path.insert(0, MockPersistenceImportHook())  # type: ignore[arg-type]
+
+    # Persist pending mutations once, on interpreter exit
+    atexit.register(flush_now)
 
-# Debug output (only if verbose)
-if os.environ.get("MOCK_VERBOSE", "").lower() == "true":
-    print(f"[sitecustomize] Mock persistence enabled for platforms: {PLATFORMS_UNDER_TEST}", file=sys.stderr)
-    print(f"[sitecustomize] State files: /tmp/mock_state_{{platform}}.json", file=sys.stderr)
+    # Debug output (only if verbose)
+    if os.environ.get("MOCK_VERBOSE", "").lower() == "true":
+        print(f"[sitecustomize] Mock persistence enabled for platforms: {PLATFORMS_UNDER_TEST}", file=sys.stderr)
+        print(f"[sitecustomize] State files: /tmp/mock_state_{{platform}}.json", file=sys.stderr)
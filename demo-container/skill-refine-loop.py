@@ -18,18 +18,22 @@ Usage:
     python skill-refine-loop.py --scenario page --platform confluence --max-attempts 5 --verbose
 """
 
-import argparse
 import atexit
 import json
+import logging
 import os
 import re
-import subprocess
 import sys
 import time
 from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Optional
 
+# subprocess, argparse, threading and logging.handlers are imported where
+# used. docker_runner is imported eagerly below, since PLATFORMS, which
+# nearly every function here reads, comes from it.
+
 # =============================================================================
 # Telemetry Setup
 # =============================================================================
@@ -38,6 +42,10 @@ from typing import Any, Optional
 sys.path.insert(0, "/workspace")
 sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
 
+# Platform configuration (plugin, library and env var names) is shared
+# with docker_runner
+from docker_runner import CROSS_PLATFORM_REQUIRED, PLATFORMS, DockerCommandBuilder
+
 try:
     from otel_setup import (
         init_telemetry,
@@ -111,70 +119,65 @@ AS_DEMO_PATH = Path(__file__).parent.parent
 # Can be overridden with SKILLS_BASE_PATH environment variable
 SKILLS_BASE_PATH = Path(os.environ.get("SKILLS_BASE_PATH", AS_DEMO_PATH.parent))
 
-# Platform-specific configuration
-# Each platform can override its path with {PLATFORM}_SKILLS_PATH env var
-# Otherwise defaults to SKILLS_BASE_PATH / {default_subdir}
-PLATFORM_CONFIG = {
-    "confluence": {
-        "skills_path_env": "CONFLUENCE_SKILLS_PATH",
-        "default_subdir": "Confluence-Assistant-Skills",
-        "plugin_name": "confluence-assistant-skills",
-        "lib_name": "confluence-as",
-        "lib_package": "confluence_as",
-        "env_vars": ["CONFLUENCE_API_TOKEN", "CONFLUENCE_EMAIL", "CONFLUENCE_SITE_URL"],
-        "mock_env_var": "CONFLUENCE_MOCK_MODE",
-        "scenarios_path": "confluence",
-    },
-    "jira": {
-        "skills_path_env": "JIRA_SKILLS_PATH",
-        "default_subdir": "Jira-Assistant-Skills",
-        "plugin_name": "jira-assistant-skills",
-        "lib_name": "jira-as",
-        "lib_package": "jira_as",
-        "env_vars": ["JIRA_API_TOKEN", "JIRA_EMAIL", "JIRA_SITE_URL"],
-        "mock_env_var": "JIRA_MOCK_MODE",
-        "scenarios_path": "jira",
-    },
-    "splunk": {
-        "skills_path_env": "SPLUNK_SKILLS_PATH",
-        "default_subdir": "Splunk-Assistant-Skills",
-        "plugin_name": "splunk-assistant-skills",
-        "lib_name": "splunk-as",
-        "lib_package": "splunk_as",
-        "env_vars": ["SPLUNK_URL", "SPLUNK_USERNAME", "SPLUNK_PASSWORD", "SPLUNK_HEC_TOKEN"],
-        "mock_env_var": "SPLUNK_MOCK_MODE",
-        "scenarios_path": "splunk",
-    },
-}
-
-# Cross-platform requires all platforms
-CROSS_PLATFORM_REQUIRED = ["confluence", "jira", "splunk"]
+# Progress output. Records are buffered and written at attempt boundaries
+# (or immediately for errors) rather than flushed line by line.
+log = logging.getLogger("refine_loop")
+_log_buffer: "logging.handlers.MemoryHandler | None" = None
+
+
+def configure_logging(verbose: bool = False) -> None:
+    """Send refine_loop records to stdout as plain messages, buffered."""
+    global _log_buffer
+    import logging.handlers
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+    _log_buffer = logging.handlers.MemoryHandler(
+        capacity=50, flushLevel=logging.ERROR, target=stream_handler
+    )
+    log.handlers[:] = [_log_buffer]
+    log.setLevel(logging.DEBUG if verbose else logging.INFO)
+    log.propagate = False
+
 
+def flush_log() -> None:
+    """Write out buffered progress output."""
+    if _log_buffer is not None:
+        _log_buffer.flush()
 
+
+# Skill/library file paths mentioned in fix agent output
+_FILE_PATTERN_RE = re.compile(r'(?:skills/|lib/|src/)[^\s\'"]+\.(?:md|py)')
+
+
+@lru_cache(maxsize=16)
 def get_skills_path(platform: str) -> Path:
     """Get the skills repository path for a platform.
 
     Resolution order:
     1. {PLATFORM}_SKILLS_PATH env var (e.g., CONFLUENCE_SKILLS_PATH)
-    2. SKILLS_BASE_PATH / {default_subdir}
-    3. {as-demo parent} / {default_subdir}
+    2. SKILLS_BASE_PATH / {default_skills_path name}
+    3. {as-demo parent} / {default_skills_path name}
+
+    Cached per platform; call get_skills_path.cache_clear() after changing
+    the environment at runtime.
     """
-    config = PLATFORM_CONFIG.get(platform)
+    config = PLATFORMS.get(platform)
     if not config:
         raise ValueError(f"Unknown platform: {platform}")
 
-    env_var = config["skills_path_env"]
+    env_var = config.skills_path_env
     if env_var in os.environ:
         return Path(os.environ[env_var])
 
-    return SKILLS_BASE_PATH / config["default_subdir"]
+    return SKILLS_BASE_PATH / Path(config.default_skills_path).name
 
 
-def get_required_platforms(platform: str) -> list[str]:
-    """Get list of required platforms for a given platform mode."""
+def get_required_platforms(platform: str) -> tuple[str, ...]:
+    """Get the required platforms for a given platform mode."""
     if platform in ("cross-platform", "all"):
         return CROSS_PLATFORM_REQUIRED
-    return [platform]
+    return (platform,)
 
 
 # =============================================================================
@@ -182,6 +185,92 @@ def get_required_platforms(platform: str) -> list[str]:
 # =============================================================================
 
 
+@lru_cache(maxsize=8)
+def _test_container_builder(platform: str, mock_mode: bool) -> DockerCommandBuilder:
+    """
+    Get the docker command builder for skill test containers.
+
+    Cached so every test run reuses the builder's credentials env file.
+    """
+    return DockerCommandBuilder(
+        platform=platform,
+        mock_mode=mock_mode,
+        skills_paths={p: get_skills_path(p) for p in get_required_platforms(platform)},
+        # Mount scenarios directory for runtime modification
+        extra_volumes=[(str(AS_DEMO_PATH / "demo-container" / "scenarios"), "/workspace/scenarios", "ro")],
+    )
+
+
+def _register_plugins_cmd(platform: str) -> str:
+    """Build the in-container command registering local plugins so Claude sees them."""
+    register_cmds = []
+    installed_plugins_file = "/home/devuser/.claude/plugins/installed_plugins.json"
+    for p in get_required_platforms(platform):
+        config = PLATFORMS[p]
+        plugin_key = f"{config.plugin_name}@local-dev"
+        install_path = config.plugin_dev_dir
+        # Use jq to add/update the plugin entry
+        register_cmds.append(
+            f"jq '.plugins[\"{plugin_key}\"] = [{{\"scope\":\"user\",\"installPath\":\"{install_path}\",\"version\":\"dev\"}}]' "
+            f"{installed_plugins_file} > /tmp/plugins.json && "
+            f"mv /tmp/plugins.json {installed_plugins_file}"
+        )
+    return "; ".join(register_cmds)
+
+
+def start_persistent_container(name: str, platform: str, mock_mode: bool = False) -> bool:
+    """
+    Start a long-lived test container and run the setup in it once.
+
+    Later tests run in it via docker exec (see run_skill_test's container
+    argument), skipping container startup and setup on every attempt.
+
+    Returns: True if the container is ready
+    """
+    import subprocess
+
+    builder = _test_container_builder(platform, mock_mode)
+    setup_cmd = f"{builder.build_setup_command()}; {_register_plugins_cmd(platform)}"
+    try:
+        subprocess.run(builder.build_start_command(name), capture_output=True, text=True, timeout=120, check=True)
+        subprocess.run(
+            builder.build_exec_command(name, setup_cmd),
+            capture_output=True,
+            text=True,
+            timeout=300,
+        )
+    except (subprocess.SubprocessError, OSError) as e:
+        log.warning(f"Warning: Could not start persistent container: {e}")
+        stop_persistent_container(name)
+        return False
+    return True
+
+
+def stop_persistent_container(name: str) -> None:
+    """Remove a container started by start_persistent_container."""
+    import subprocess
+
+    try:
+        subprocess.run(["docker", "rm", "-f", name], capture_output=True, timeout=60)
+    except (subprocess.SubprocessError, OSError):
+        pass
+
+
+def kill_container_processes(name: str) -> None:
+    """
+    Kill every process in a persistent container except its PID 1 sleep.
+
+    Killing a timed-out docker exec client leaves the command running in
+    the container; this stops it before the container is reused.
+    """
+    import subprocess
+
+    try:
+        subprocess.run(["docker", "exec", name, "bash", "-c", "kill -KILL -1"], capture_output=True, timeout=60)
+    except (subprocess.SubprocessError, OSError):
+        pass
+
+
 def run_skill_test(
     scenario: str,
     platform: str,
@@ -195,153 +284,54 @@ def run_skill_test(
     checkpoint_file: str | None = None,
     fork_from: int | None = None,
     mock_mode: bool = False,
+    container: str | None = None,
 ) -> tuple[bool, dict | None]:
     """
     Run skill test with local source mounts.
 
+    If container names a persistent container (see start_persistent_container),
+    the test is run there with docker exec instead of in a fresh container.
+
     Returns: (all_passed, fix_context_or_none)
     """
-    required_platforms = get_required_platforms(platform)
-
-    # Build docker command
-    cmd = ["docker", "run", "--rm"]
+    import subprocess
 
-    # Add environment variables for all required platforms
-    for p in required_platforms:
-        config = PLATFORM_CONFIG[p]
-        for var in config["env_vars"]:
-            cmd.extend(["-e", f"{var}={os.environ.get(var, '')}"])
-        # Enable mock mode if requested
-        if mock_mode:
-            cmd.extend(["-e", f"{config['mock_env_var']}=true"])
-
-    # Set platform under test
-    cmd.extend(["-e", f"SKILL_TEST_PLATFORM={platform}"])
-
-    # Add credential mounts
-    secrets_dir = AS_DEMO_PATH / "secrets"
-    if (secrets_dir / ".credentials.json").exists():
-        cmd.extend(["-v", f"{secrets_dir}/.credentials.json:/home/devuser/.claude/.credentials.json:ro"])
-    if (secrets_dir / ".claude.json").exists():
-        cmd.extend(["-v", f"{secrets_dir}/.claude.json:/home/devuser/.claude/.claude.json:ro"])
-
-    # Add volume mounts for each platform's plugin and library
-    for p in required_platforms:
-        config = PLATFORM_CONFIG[p]
-        skills_path = get_skills_path(p)
-
-        # Find plugin path - check multiple possible locations:
-        # 1. skills_path/plugins/{plugin_name}
-        # 2. skills_path/{plugin_name}
-        # 3. skills_path itself (if it has .claude-plugin/ or skills/)
-        plugin_path = skills_path / "plugins" / config["plugin_name"]
-        if not plugin_path.exists():
-            plugin_path = skills_path / config["plugin_name"]
-        if not plugin_path.exists():
-            # Check if skills_path root is the plugin itself
-            if (skills_path / ".claude-plugin").exists() or (skills_path / "skills").exists():
-                plugin_path = skills_path
-
-        # Library path - check multiple possible locations:
-        # 1. skills_path/{lib_name}
-        # 2. Sibling directory: skills_path/../{lib_name}
-        lib_path = skills_path / config["lib_name"]
-        if not lib_path.exists():
-            lib_path = skills_path.parent / config["lib_name"]
-
-        if plugin_path.exists():
-            cmd.extend([
-                "-v",
-                f"{plugin_path}:/home/devuser/.claude/plugins/cache/{config['plugin_name']}/{config['plugin_name']}/dev:ro",
-            ])
-
-        if lib_path.exists():
-            cmd.extend(["-v", f"{lib_path}:/opt/{config['lib_name']}:ro"])
-
-    # Ensure checkpoint directory exists on host
-    checkpoint_dir = Path("/tmp/checkpoints")
-    checkpoint_dir.mkdir(parents=True, exist_ok=True)
-    cmd.extend(["-v", "/tmp/checkpoints:/tmp/checkpoints"])
-
-    # Mount scenarios directory for runtime modification
-    scenarios_dir = AS_DEMO_PATH / "demo-container" / "scenarios"
-    cmd.extend(["-v", f"{scenarios_dir}:/workspace/scenarios:ro"])
-
-    # Add entrypoint and image
-    cmd.extend([
-        "--entrypoint", "bash",
-        "as-demo-container:latest",
-        "-c",
-    ])
-
-    # Build the inner command
-    # Install all required platform libraries
-    lib_installs = []
-    symlink_cmds = []
-    for p in required_platforms:
-        config = PLATFORM_CONFIG[p]
-        lib_path = f"/opt/{config['lib_name']}"
-        lib_installs.append(f"pip install -q -e {lib_path} 2>/dev/null")
-        # Remove version symlink and replace with dev
-        plugin_cache = f"/home/devuser/.claude/plugins/cache/{config['plugin_name']}/{config['plugin_name']}"
-        symlink_cmds.append(f"rm -f {plugin_cache}/*[0-9]* 2>/dev/null; ln -sf dev {plugin_cache}/latest 2>/dev/null")
-
-    install_cmd = "; ".join(lib_installs)
-    symlink_cmd = "; ".join(symlink_cmds)
-
-    # Register local plugins in installed_plugins.json so Claude sees them
-    register_cmds = []
-    installed_plugins_file = "/home/devuser/.claude/plugins/installed_plugins.json"
-    for p in required_platforms:
-        config = PLATFORM_CONFIG[p]
-        plugin_key = f"{config['plugin_name']}@local-dev"
-        install_path = f"/home/devuser/.claude/plugins/cache/{config['plugin_name']}/{config['plugin_name']}/dev"
-        # Use jq to add/update the plugin entry
-        register_cmds.append(
-            f"jq '.plugins[\"{plugin_key}\"] = [{{\"scope\":\"user\",\"installPath\":\"{install_path}\",\"version\":\"dev\"}}]' "
-            f"{installed_plugins_file} > /tmp/plugins.json && "
-            f"mv /tmp/plugins.json {installed_plugins_file}"
-        )
-    register_cmd = "; ".join(register_cmds)
+    required_platforms = get_required_platforms(platform)
+    builder = _test_container_builder(platform, mock_mode)
+    scenario_path = builder.get_scenario_path(scenario)
 
-    # Determine scenario path
-    if platform in ("cross-platform", "all"):
-        scenario_path = f"/workspace/scenarios/cross-platform/{scenario}.prompts"
-    else:
-        scenario_path = f"/workspace/scenarios/{PLATFORM_CONFIG[platform]['scenarios_path']}/{scenario}.prompts"
-
-    inner_cmd = (
-        f"{install_cmd}; "
-        f"{symlink_cmd}; "
-        f"{register_cmd}; "
-        "mkdir -p /tmp/checkpoints; "
-        f"python /workspace/skill-test.py {scenario_path} "
-        f"--model {model} --judge-model {judge_model}"
-    )
+    parts = [
+        f"python /workspace/skill-test.py {scenario_path} ",
+        f"--model {model} --judge-model {judge_model}",
+    ]
 
     # Add conversation mode and fail-fast for checkpoint-based iteration
     if conversation:
-        inner_cmd += " --conversation"
+        parts.append(" --conversation")
     if fail_fast:
-        inner_cmd += " --fail-fast"
+        parts.append(" --fail-fast")
     if checkpoint_file:
-        inner_cmd += f" --checkpoint-file {checkpoint_file}"
+        parts.append(f" --checkpoint-file {checkpoint_file}")
     if fork_from is not None:
-        inner_cmd += f" --fork-from {fork_from}"
+        parts.append(f" --fork-from {fork_from}")
     if prompt_index is not None:
-        inner_cmd += f" --prompt-index {prompt_index}"
+        parts.append(f" --prompt-index {prompt_index}")
     if fix_context:
         skills_paths = ",".join(str(get_skills_path(p)) for p in required_platforms)
-        inner_cmd += f" --fix-context {skills_paths}"
+        parts.append(f" --fix-context {skills_paths}")
     if verbose:
-        inner_cmd += " --verbose"
+        parts.append(" --verbose")
     if mock_mode:
-        inner_cmd += " --mock"
+        parts.append(" --mock")
+    test_cmd = "".join(parts)
 
-    cmd.append(inner_cmd)
+    if container:
+        # Setup already ran; start from clean mock state as a fresh container would
+        cmd = builder.build_exec_command(container, f"rm -f /tmp/mock_state_*; {test_cmd}")
+    else:
+        cmd = builder.build_run_command(entrypoint=f"{_register_plugins_cmd(platform)}; {test_cmd}")
 
-    if verbose:
-        print(f"Running: docker run ... (scenario={scenario}, platform={platform})")
+    log.debug(f"Running: docker {cmd[1]} ... (scenario={scenario}, platform={platform})")
 
     try:
         result = subprocess.run(
@@ -351,10 +341,12 @@ def run_skill_test(
             timeout=600,  # 10 minute timeout
         )
     except subprocess.TimeoutExpired:
-        print("Error: Test timed out")
+        log.error("Error: Test timed out")
+        if container:
+            kill_container_processes(container)
         return False, None
     except Exception as e:
-        print(f"Error running test: {e}")
+        log.error(f"Error running test: {e}")
         return False, None
 
     # Parse output
@@ -362,34 +354,28 @@ def run_skill_test(
         # Output is fix context JSON
         stdout = result.stdout.strip()
 
-        # Try to parse the whole stdout as JSON
-        try:
-            ctx = json.loads(stdout)
-            if isinstance(ctx, dict):
-                if ctx.get("status") == "all_passed":
-                    return True, None
-                return False, ctx
-        except json.JSONDecodeError:
-            pass
-
-        # Find JSON object in output
+        # Decode the JSON object starting at the first brace in a single
+        # pass, without slicing the (possibly large) output
+        ctx = None
         brace_idx = stdout.find("{")
         if brace_idx >= 0:
             try:
-                ctx = json.loads(stdout[brace_idx:])
-                if isinstance(ctx, dict):
-                    if ctx.get("status") == "all_passed":
-                        return True, None
-                    return False, ctx
+                ctx, _ = json.JSONDecoder().raw_decode(stdout, brace_idx)
             except json.JSONDecodeError:
                 pass
 
-        print("Error: Could not parse fix context from output")
-        if verbose:
-            print(f"stdout length: {len(result.stdout)}")
-            print(f"stderr length: {len(result.stderr)}")
-            print(f"stdout (last 2000 chars): {result.stdout[-2000:]}")
-            print(f"stderr (last 500 chars): {result.stderr[-500:]}")
+        if isinstance(ctx, dict):
+            if ctx.get("status") == "all_passed":
+                return True, None
+            return False, ctx
+
+        log.debug("\n".join([
+            f"stdout length: {len(result.stdout)}",
+            f"stderr length: {len(result.stderr)}",
+            f"stdout (last 2000 chars): {result.stdout[-2000:]}",
+            f"stderr (last 500 chars): {result.stderr[-500:]}",
+        ]))
+        log.error("Error: Could not parse fix context from output")
         return False, None
     else:
         # Check exit code for pass/fail
@@ -445,6 +431,10 @@ def run_fix_agent(
 
     Returns: {"success": bool, "files_changed": [...], "summary": "...", "session_id": "..."}
     """
+    import signal
+    import subprocess
+    import threading
+
     required_platforms = get_required_platforms(platform)
     failure = fix_context["failure"]
 
@@ -480,10 +470,10 @@ def run_fix_agent(
 
     # Add paths for all platforms involved
     for p in required_platforms:
-        config = PLATFORM_CONFIG[p]
+        config = PLATFORMS[p]
         skills_path = get_skills_path(p)
-        prompt += f"**{p.title()} skill files:** {skills_path}/{config['plugin_name']}/skills/\n"
-        prompt += f"**{p.title()} library files:** {skills_path}/{config['lib_name']}/src/{config['lib_package']}/\n"
+        prompt += f"**{p.title()} skill files:** {skills_path}/{config.plugin_name}/skills/\n"
+        prompt += f"**{p.title()} library files:** {skills_path}/{config.lib_name}/src/{config.lib_package}/\n"
 
     prompt += "\nCurrent relevant file contents:\n"
 
@@ -521,52 +511,95 @@ Make minimal, focused changes. Edit the actual files - do not just describe what
 After making changes, provide a brief summary of what you changed and why.
 """
 
-    if verbose:
-        print(f"Running fix agent with context for prompt: {failure['prompt_text'][:50]}...")
-        if session_id:
-            print(f"Continuing session: {session_id}")
+    log.debug(f"Running fix agent with context for prompt: {failure['prompt_text'][:50]}...")
+    if session_id:
+        log.debug(f"Continuing session: {session_id}")
 
     # Determine working directory - use first platform's skills path
     primary_skills_path = get_skills_path(required_platforms[0])
 
-    # Run Claude to make the fixes
+    # Run Claude to make the fixes, streaming events as they happen so
+    # progress shows while the agent works
     cmd = [
         "claude",
         "-p", prompt,
         "--model", "opus",
         "--dangerously-skip-permissions",
-        "--output-format", "json",
+        "--output-format", "stream-json",
+        "--verbose",
     ]
 
     if session_id:
         cmd.extend(["--resume", session_id])
 
     try:
-        result = subprocess.run(
+        proc = subprocess.Popen(
             cmd,
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
             text=True,
-            timeout=300,
             cwd=str(primary_skills_path),
+            start_new_session=True,  # own process group, killed as a whole
         )
-    except subprocess.TimeoutExpired:
-        return {"success": False, "files_changed": [], "summary": "Fix agent timed out", "session_id": session_id}
     except Exception as e:
         return {"success": False, "files_changed": [], "summary": f"Fix agent error: {e}", "session_id": session_id}
 
-    # Parse output
-    output = result.stdout
-    new_session_id = _parse_fix_agent_output(output, session_id)
-    output = _extract_text_from_output(output)
+    timed_out = threading.Event()
 
-    # Look for file edit indicators
-    files_changed = []
+    def _kill() -> None:
+        # Kill the agent's tool subprocesses too; they hold the stdout pipe
+        # open and would keep the read loop below waiting
+        timed_out.set()
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    timer = threading.Timer(300, _kill)
+    timer.start()
+    texts: list[str] = []
+    edited_paths: list[str] = []
+    result_line = ""
+    try:
+        for line in proc.stdout:
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            event_type = event.get("type")
+            if event_type == "assistant":
+                for block in event.get("message", {}).get("content", []):
+                    if block.get("type") == "text":
+                        texts.append(block["text"])
+                        log.info(f"  {block['text']}")
+                        flush_log()
+                    elif block.get("type") == "tool_use" and block.get("name") in ("Edit", "MultiEdit", "Write"):
+                        path = block.get("input", {}).get("file_path", "")
+                        edited_paths.append(path)
+                        log.debug(f"  [{block['name']}] {path}")
+                        flush_log()
+            elif event_type == "result":
+                result_line = line
+        returncode = proc.wait()
+    finally:
+        timer.cancel()
+
+    # Partial output from a killed agent is not a result
+    if timed_out.is_set():
+        return {"success": False, "files_changed": [], "summary": "Fix agent timed out after 300s", "session_id": session_id}
+
+    # Parse output; the final result event carries the session ID and text
+    new_session_id = _parse_fix_agent_output(result_line, session_id) if result_line else session_id
+    output = _extract_text_from_output(result_line) if result_line else "\n".join(texts)
+
+    # Files the agent edited, plus any mentioned alongside edit indicators
+    files_changed = set(_FILE_PATTERN_RE.findall(" ".join(edited_paths)))
     if "Edit" in output or "edited" in output.lower() or "updated" in output.lower():
-        file_patterns = re.findall(r'(?:skills/|lib/|src/)[^\s\'"]+\.(?:md|py)', output)
-        files_changed = list(set(file_patterns))
+        files_changed.update(_FILE_PATTERN_RE.findall(output))
+    files_changed = list(files_changed)
 
     return {
-        "success": result.returncode == 0,
+        "success": returncode == 0,
         "files_changed": files_changed,
         "summary": output[-500:] if len(output) > 500 else output,
         "session_id": new_session_id,
@@ -599,21 +632,30 @@ def run_refinement_loop(
     """
     loop_start_time = time.time()
 
-    print(f"{'=' * 70}")
-    print("SKILL REFINEMENT LOOP (with checkpoint-based iteration)")
-    print(f"{'=' * 70}")
-    print(f"Scenario: {scenario}")
-    print(f"Platform: {platform}")
+    if not log.handlers:
+        configure_logging(verbose)
+
+    banner = [
+        f"{'=' * 70}",
+        "SKILL REFINEMENT LOOP (with checkpoint-based iteration)",
+        f"{'=' * 70}",
+        f"Scenario: {scenario}",
+        f"Platform: {platform}",
+    ]
 
     required_platforms = get_required_platforms(platform)
     for p in required_platforms:
-        print(f"  {p.title()} skills: {get_skills_path(p)}")
-
-    print(f"Max attempts: {max_attempts}")
-    print(f"Model: {model}, Judge: {judge_model}")
-    print(f"Mock mode: {mock_mode}")
-    print(f"{'=' * 70}")
-    print()
+        banner.append(f"  {p.title()} skills: {get_skills_path(p)}")
+
+    banner += [
+        f"Max attempts: {max_attempts}",
+        f"Model: {model}, Judge: {judge_model}",
+        f"Mock mode: {mock_mode}",
+        f"{'=' * 70}",
+        "",
+    ]
+    log.info("\n".join(banner))
+    flush_log()
 
     # Log refinement start
     log_to_loki(
@@ -638,6 +680,15 @@ def run_refinement_loop(
     last_failing_prompt_index: int | None = None
     success = False
 
+    # One container serves every attempt; fall back to a fresh container
+    # per attempt if it can't be started
+    container_name = f"skill-refine-{platform}-{scenario}-{os.getpid()}"
+    if start_persistent_container(container_name, platform, mock_mode=mock_mode):
+        container: str | None = container_name
+        atexit.register(stop_persistent_container, container_name)
+    else:
+        container = None
+
     with trace_span(
         "refine.run",
         attributes={
@@ -651,8 +702,8 @@ def run_refinement_loop(
     ) as run_span:
         for attempt in range(1, max_attempts + 1):
             attempt_start_time = time.time()
-            print(f"[Attempt {attempt}/{max_attempts}]")
-            print("-" * 40)
+            flush_log()
+            log.info(f"[Attempt {attempt}/{max_attempts}]\n{'-' * 40}")
 
             # Determine if we should fork from checkpoint
             fork_from: int | None = None
@@ -662,10 +713,10 @@ def run_refinement_loop(
                 if last_failing_prompt_index > 0:
                     fork_from = last_failing_prompt_index - 1
                     prompt_index = last_failing_prompt_index
-                    print(f"Forking from checkpoint {fork_from}, running prompt {prompt_index}")
+                    log.info(f"Forking from checkpoint {fork_from}, running prompt {prompt_index}")
                 else:
                     prompt_index = 0
-                    print("First prompt failed, running from start")
+                    log.info("First prompt failed, running from start")
 
             # Log attempt start
             log_to_loki(
@@ -703,13 +754,11 @@ def run_refinement_loop(
                     fork_from=fork_from,
                     prompt_index=prompt_index,
                     mock_mode=mock_mode,
+                    container=container,
                 )
 
                 if all_passed:
-                    print()
-                    print(f"{'=' * 70}")
-                    print(f"SUCCESS: All tests passed on attempt {attempt}")
-                    print(f"{'=' * 70}")
+                    log.info(f"\n{'=' * 70}\nSUCCESS: All tests passed on attempt {attempt}\n{'=' * 70}")
 
                     if attempt_span:
                         attempt_span.set_attribute("result", "success")
@@ -718,26 +767,29 @@ def run_refinement_loop(
                     break
 
                 if not fix_ctx:
-                    print("Error: Test failed but no fix context available")
+                    log.error("Error: Test failed but no fix context available")
                     if attempt_span:
                         attempt_span.set_attribute("result", "no_context")
                     continue
 
                 failure = fix_ctx.get("failure", {})
                 last_failing_prompt_index = failure.get("prompt_index")
-                print(f"Failed at prompt {last_failing_prompt_index}: {failure.get('prompt_text', 'unknown')[:60]}...")
-                print(f"Quality: {failure.get('quality', 'unknown')}")
-                print(f"Refinement suggestion: {failure.get('refinement_suggestion', 'none')[:100]}...")
-                print()
+                log.info("\n".join([
+                    f"Failed at prompt {last_failing_prompt_index}: {failure.get('prompt_text', 'unknown')[:60]}...",
+                    f"Quality: {failure.get('quality', 'unknown')}",
+                    f"Refinement suggestion: {failure.get('refinement_suggestion', 'none')[:100]}...",
+                    "",
+                ]))
 
                 if attempt_span:
                     attempt_span.set_attribute("failed_prompt", last_failing_prompt_index)
                     attempt_span.set_attribute("quality", failure.get('quality', 'unknown'))
 
                 # Run fix agent with session continuity
-                print("Running fix agent...")
+                log.info("Running fix agent...")
                 if fix_session_id:
-                    print(f"Continuing fix session: {fix_session_id[:20]}...")
+                    log.info(f"Continuing fix session: {fix_session_id[:20]}...")
+                flush_log()
                 fix_result = run_fix_agent(
                     fix_ctx,
                     platform,
@@ -757,7 +809,7 @@ def run_refinement_loop(
 
                 files_changed = fix_result["files_changed"]
                 if files_changed:
-                    print(f"Files changed: {files_changed}")
+                    log.info(f"Files changed: {files_changed}")
 
                     # Log fix applied
                     log_to_loki(
@@ -773,14 +825,13 @@ def run_refinement_loop(
                         },
                     )
                 else:
-                    print("No files changed (fix may have failed)")
+                    log.info("No files changed (fix may have failed)")
 
                 if attempt_span:
                     attempt_span.set_attribute("files_changed", ",".join(files_changed) if files_changed else "none")
                     attempt_span.set_attribute("result", "fix_applied" if files_changed else "no_fix")
 
-                print(f"Summary: {fix_result['summary'][:200]}...")
-                print()
+                log.info(f"Summary: {fix_result['summary'][:200]}...\n")
 
         # Update run span with final stats
         loop_duration = time.time() - loop_start_time
@@ -789,6 +840,11 @@ def run_refinement_loop(
             run_span.set_attribute("total_attempts", len(attempt_history) + (1 if success else 0))
             run_span.set_attribute("total_duration_seconds", loop_duration)
 
+    # The atexit hook only covers exits that skip this point
+    if container:
+        stop_persistent_container(container)
+        atexit.unregister(stop_persistent_container)
+
     # Log refinement complete
     log_to_loki(
         f"Refinement loop completed: {platform}/{scenario} - {'SUCCESS' if success else 'FAILED'}",
@@ -805,9 +861,8 @@ def run_refinement_loop(
     )
 
     if not success:
-        print(f"{'=' * 70}")
-        print(f"FAILED: Max attempts ({max_attempts}) reached without passing all tests")
-        print(f"{'=' * 70}")
+        log.info(f"{'=' * 70}\nFAILED: Max attempts ({max_attempts}) reached without passing all tests\n{'=' * 70}")
+    flush_log()
 
     return success
 
@@ -818,6 +873,8 @@ def run_refinement_loop(
 
 
 def main():
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="Skill Refinement Loop - Iteratively test and fix Assistant Skills",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -851,6 +908,8 @@ Telemetry (enabled by default):
                         help="Disable telemetry (traces and logs)")
     args = parser.parse_args()
 
+    configure_logging(args.verbose)
+
     # Initialize telemetry
     scenario_name = f"{args.platform}_{args.scenario}"
     init_telemetry(
@@ -865,31 +924,34 @@ Telemetry (enabled by default):
     required_platforms = get_required_platforms(args.platform)
     for platform in required_platforms:
         skills_path = get_skills_path(platform)
-        config = PLATFORM_CONFIG[platform]
+        config = PLATFORMS[platform]
 
         # Check multiple possible plugin locations
-        plugin_path = skills_path / "plugins" / config["plugin_name"]
+        plugin_path = skills_path / "plugins" / config.plugin_name
         if not plugin_path.exists():
-            plugin_path = skills_path / config["plugin_name"]
+            plugin_path = skills_path / config.plugin_name
         if not plugin_path.exists():
             # Check if skills_path root is the plugin itself
             if (skills_path / ".claude-plugin").exists() or (skills_path / "skills").exists():
                 plugin_path = skills_path
 
         if not plugin_path.exists():
-            print(f"Error: {platform.title()} plugin not found at {skills_path}")
-            print(f"  Expected one of:")
-            print(f"    - {skills_path}/plugins/{config['plugin_name']}")
-            print(f"    - {skills_path}/{config['plugin_name']}")
-            print(f"    - {skills_path}/ (with .claude-plugin/ or skills/)")
+            log.error("\n".join([
+                f"Error: {platform.title()} plugin not found at {skills_path}",
+                "  Expected one of:",
+                f"    - {skills_path}/plugins/{config.plugin_name}",
+                f"    - {skills_path}/{config.plugin_name}",
+                f"    - {skills_path}/ (with .claude-plugin/ or skills/)",
+            ]))
+            flush_log()
             sys.exit(1)
 
     # Check environment for required platforms
     for platform in required_platforms:
-        config = PLATFORM_CONFIG[platform]
-        primary_env = config["env_vars"][0]  # e.g., JIRA_API_TOKEN
+        config = PLATFORMS[platform]
+        primary_env = config.env_vars[0]  # e.g., JIRA_API_TOKEN
         if not os.environ.get(primary_env):
-            print(f"Warning: {primary_env} not set for {platform}")
+            log.warning(f"Warning: {primary_env} not set for {platform}")
 
     success = run_refinement_loop(
         scenario=args.scenario,
@@ -901,6 +963,7 @@ Telemetry (enabled by default):
         mock_mode=args.mock,
     )
 
+    flush_log()
     sys.exit(0 if success else 1)
 
 
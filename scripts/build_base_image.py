@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Build the prewarmed AS-Demo image.
+
+Layers editable installs of the platform libraries and the dev plugin
+symlinks on top of as-demo-container:latest, so skill test runs can skip
+that setup on every container start. At runtime the library and plugin
+bind mounts overlay the same paths, so live source is still used.
+
+Usage:
+    python scripts/build_base_image.py
+    python scripts/build_base_image.py --base as-demo-container:latest --tag as-demo-container:prewarmed
+
+Environment Variables:
+    CONFLUENCE_SKILLS_PATH, JIRA_SKILLS_PATH, SPLUNK_SKILLS_PATH:
+        Skills repositories containing the platform libraries
+"""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+
+from docker_runner import (
+    DEFAULT_IMAGE,
+    PLATFORMS,
+    PREWARMED_IMAGE,
+    find_lib_path,
+    get_skills_path,
+)
+
+# The base image snapshots ~/.claude here; entrypoint.sh restores it over
+# a tmpfs home, so plugin symlinks must exist in both trees
+CLAUDE_DIR = "/home/devuser/.claude"
+CLAUDE_SNAPSHOT_DIR = "/opt/devuser-claude"
+
+
+def build_dockerfile(base_image: str, lib_names: list[str]) -> str:
+    """Build the Dockerfile for the prewarmed image."""
+    lines = [f"FROM {base_image}"]
+
+    # Each library comes from its own named build context
+    for lib_name in lib_names:
+        lines.append(f"COPY --from={lib_name} --chown=devuser:node . /opt/{lib_name}")
+
+    if lib_names:
+        editables = " ".join(f"-e /opt/{lib_name}" for lib_name in lib_names)
+        lines.append(f"RUN pip install -q --no-deps --disable-pip-version-check {editables}")
+
+    # Point each plugin's "latest" at the dev mount, as the run wrapper does,
+    # in the live config and in the snapshot restored from it at startup
+    symlink_cmds = []
+    for config in PLATFORMS.values():
+        for root in (CLAUDE_DIR, CLAUDE_SNAPSHOT_DIR):
+            plugin_cache = config.plugin_cache_dir.replace(CLAUDE_DIR, root, 1)
+            symlink_cmds.append(f"mkdir -p {plugin_cache} && rm -f {plugin_cache}/*[0-9]* && ln -sfn dev {plugin_cache}/latest")
+    lines.append("RUN " + " && ".join(symlink_cmds))
+
+    return "\n".join(lines) + "\n"
+
+
+def build_image(base_image: str, tag: str) -> int:
+    """Build the prewarmed image. Returns the docker exit code."""
+    build_contexts = []
+    lib_names = []
+    for name, config in PLATFORMS.items():
+        lib_path = find_lib_path(get_skills_path(name), config.lib_name)
+        if lib_path:
+            build_contexts.extend(["--build-context", f"{config.lib_name}={lib_path}"])
+            lib_names.append(config.lib_name)
+        else:
+            print(f"Warning: {name} library not found, skipping {config.lib_name}")
+
+    dockerfile = build_dockerfile(base_image, lib_names)
+
+    # Everything is copied from named contexts; the main context is empty
+    with tempfile.TemporaryDirectory() as context_dir:
+        cmd = [
+            "docker", "buildx", "build",
+            *build_contexts,
+            "--load",
+            "-t", tag,
+            "-f", "-",
+            context_dir,
+        ]
+        print(f"Building {tag} from {base_image}")
+        return subprocess.run(cmd, input=dockerfile, text=True).returncode
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Build the prewarmed AS-Demo image")
+    parser.add_argument("--base", default=DEFAULT_IMAGE, help=f"Base image (default: {DEFAULT_IMAGE})")
+    parser.add_argument("--tag", default=PREWARMED_IMAGE, help=f"Image tag (default: {PREWARMED_IMAGE})")
+    args = parser.parse_args()
+
+    sys.exit(build_image(args.base, args.tag))
+
+
+if __name__ == "__main__":
+    main()
@@ -18,53 +18,150 @@ Environment Variables:
 
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
 
-from confluence_base import ConfluenceClient, require_config
+from confluence_base import ConfluenceClient, parse_json, require_config
 
 # Additional configuration
 PRESERVE_LABEL = os.environ.get("DEMO_PRESERVE_LABEL", "demo")
 
+# Concurrent API requests; each one is independent and I/O bound
+MAX_WORKERS = 16
 
-def get_page_labels(client: ConfluenceClient, page_id):
-    """Get labels for a page."""
-    response = client.get(f"/wiki/api/v2/pages/{page_id}/labels")
+
+def get_page_labels(client: ConfluenceClient, page):
+    """Get labels for a page, from the page listing when it has them all."""
+    inline = page.get("labels")
+    if inline is not None and not inline.get("meta", {}).get("hasMore"):
+        return [label["name"] for label in inline.get("results", [])]
+
+    response = client.get(f"/wiki/api/v2/pages/{page['id']}/labels")
     if response.status_code == 200:
-        data = response.json()
+        data = parse_json(response)
         return [label["name"] for label in data.get("results", [])]
     return []
 
 
-def get_all_pages(client: ConfluenceClient, space_id):
-    """Get all pages in the space."""
+def get_all_pages(client: ConfluenceClient, space_id, raise_on_error=False):
+    """
+    Get all pages in the space.
+
+    A failed request ends the listing early, so the result may be partial;
+    with raise_on_error it raises RuntimeError instead.
+    """
     pages = []
     endpoint = f"/wiki/api/v2/spaces/{space_id}/pages"
-    params = {"limit": 100}
-
-    while endpoint:
-        response = client.get(endpoint, params=params)
-        if response.status_code != 200:
-            print(f"Failed to get pages: {response.status_code}")
-            break
-
-        data = response.json()
-        pages.extend(data.get("results", []))
-
-        # Handle pagination
-        links = data.get("_links", {})
-        next_link = links.get("next")
-        if next_link:
-            endpoint = next_link
-            params = {}  # Next URL includes params
-        else:
-            endpoint = None
+
+    # Request the largest page size the v2 API allows, with labels inline,
+    # and fetch the next page while the current one is being processed
+    params = {"limit": 250, "include-labels": "true"}
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(client.get, endpoint, params=params)
+        while future:
+            response = future.result()
+            if response.status_code != 200:
+                if raise_on_error:
+                    raise RuntimeError(f"Failed to get pages: {response.status_code}")
+                print(f"Failed to get pages: {response.status_code}")
+                break
+
+            data = parse_json(response)
+
+            # Handle pagination; the next URL includes params
+            next_link = data.get("_links", {}).get("next")
+            future = executor.submit(client.get, next_link) if next_link else None
+
+            pages.extend(data.get("results", []))
 
     return pages
 
 
 def delete_page(client: ConfluenceClient, page_id):
-    """Delete a page."""
+    """Delete a page. Returns True once the page is confirmed gone."""
     response = client.delete(f"/wiki/api/v2/pages/{page_id}")
-    return response.status_code in [200, 204]
+    # 404: already gone, e.g. deleted along with an ancestor
+    return response.status_code in [200, 204, 404]
+
+
+def page_depths(pages):
+    """Get the depth of each page in the page tree, by following parentId."""
+    pages_by_id = {p["id"]: p for p in pages}
+    depths = {}
+    for page in pages:
+        # Walk up to a root or an already known page, then number the path
+        path = []
+        page_id = page["id"]
+        while page_id in pages_by_id and page_id not in depths and page_id not in path:
+            path.append(page_id)
+            page_id = pages_by_id[page_id].get("parentId")
+        depth = depths.get(page_id, -1)
+        for page_id in reversed(path):
+            depth += 1
+            depths[page_id] = depth
+    return depths
+
+
+def delete_pages(client: ConfluenceClient, pages, all_pages):
+    """
+    Delete pages children first. Returns the number deleted.
+
+    Depths come from the parent links in all_pages, the full page listing,
+    so ancestors outside the pages being deleted still count.
+    """
+    depths = page_depths(all_pages)
+
+    def depth(page):
+        return depths.get(page["id"], 0)
+
+    pages_sorted = sorted(pages, key=depth, reverse=True)
+
+    # Pages at the same depth can't be ancestors of each other, so each
+    # level is deleted concurrently before moving up to the next one
+    deleted_count = 0
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        for _, level in groupby(pages_sorted, key=depth):
+            level = list(level)
+            results = executor.map(lambda p: delete_page(client, p["id"]), level)
+            for page, deleted in zip(level, results):
+                print(f"  Deleting: {page['title']} (ID: {page['id']})")
+                if deleted:
+                    deleted_count += 1
+                else:
+                    print(f"    Failed to delete {page['title']}")
+
+    return deleted_count
+
+
+def split_covered_pages(pages, to_delete, preserved):
+    """
+    Split pages to delete into those to delete directly and those covered
+    by deleting an ancestor.
+
+    A page is covered when its parent is being deleted and the parent's
+    subtree holds no preserved page, so a cascading delete of the parent
+    can't take preserved content with it.
+    """
+    pages_by_id = {p["id"]: p for p in pages}
+    deleting_ids = {p["id"] for p in to_delete}
+
+    # Pages with a preserved descendant must be deleted after their children
+    protected_ids = set()
+    for page in preserved:
+        parent_id = page.get("parentId")
+        while parent_id in pages_by_id and parent_id not in protected_ids:
+            protected_ids.add(parent_id)
+            parent_id = pages_by_id[parent_id].get("parentId")
+
+    direct = []
+    covered = []
+    for page in to_delete:
+        parent_id = page.get("parentId")
+        if parent_id in deleting_ids and parent_id not in protected_ids:
+            covered.append(page)
+        else:
+            direct.append(page)
+    return direct, covered
 
 
 def delete_comments(client: ConfluenceClient, page_id):
@@ -73,7 +170,7 @@ def delete_comments(client: ConfluenceClient, page_id):
     if response.status_code != 200:
         return
 
-    data = response.json()
+    data = parse_json(response)
     for comment in data.get("results", []):
         comment_id = comment["id"]
         client.delete(f"/wiki/api/v2/footer-comments/{comment_id}")
@@ -87,60 +184,68 @@ def cleanup_sandbox():
 
     # Validate and get configuration
     config = require_config()
-    client = ConfluenceClient(config)
-
-    print(f"Site: {config.site_url}")
-    print(f"Space: {config.space_key}")
-    print(f"Preserving pages with label: {PRESERVE_LABEL}")
+    with ConfluenceClient(config) as client:
+        print(f"Site: {config.site_url}")
+        print(f"Space: {config.space_key}")
+        print(f"Preserving pages with label: {PRESERVE_LABEL}")
+
+        # Get space ID
+        space_id = client.get_space_id()
+        if not space_id:
+            print(f"\nSpace {config.space_key} not found")
+            sys.exit(1)
+
+        print(f"\nSpace ID: {space_id}")
+
+        # Get all pages
+        pages = get_all_pages(client, space_id)
+        print(f"Found {len(pages)} pages")
+
+        # Categorize pages
+        preserved = []
+        to_delete = []
+
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            page_labels = executor.map(lambda p: get_page_labels(client, p), pages)
+            for page, labels in zip(pages, page_labels):
+                if PRESERVE_LABEL in labels:
+                    preserved.append(page)
+                    print(f"  Preserving: {page['title']}")
+                else:
+                    to_delete.append(page)
 
-    # Get space ID
-    space_id = client.get_space_id()
-    if not space_id:
-        print(f"\nSpace {config.space_key} not found")
-        sys.exit(1)
-
-    print(f"\nSpace ID: {space_id}")
-
-    # Get all pages
-    pages = get_all_pages(client, space_id)
-    print(f"Found {len(pages)} pages")
-
-    # Categorize pages
-    preserved = []
-    to_delete = []
-
-    for page in pages:
-        labels = get_page_labels(client, page["id"])
-        if PRESERVE_LABEL in labels:
-            preserved.append(page)
             # Clean up comments on preserved pages
-            print(f"  Preserving: {page['title']}")
-            delete_comments(client, page["id"])
-        else:
-            to_delete.append(page)
-
-    print(f"\nPages to preserve: {len(preserved)}")
-    print(f"Pages to delete: {len(to_delete)}")
-
-    # Delete non-preserved pages (children first)
-    # Sort by depth (more slashes in path = deeper)
-    to_delete_sorted = sorted(
-        to_delete,
-        key=lambda p: p.get("_links", {}).get("webui", "").count("/"),
-        reverse=True
-    )
-
-    deleted_count = 0
-    for page in to_delete_sorted:
-        print(f"  Deleting: {page['title']} (ID: {page['id']})")
-        if delete_page(client, page["id"]):
-            deleted_count += 1
-        else:
-            print(f"    Failed to delete {page['title']}")
-
-    print("\nCleanup complete!")
-    print(f"  Deleted: {deleted_count} pages")
-    print(f"  Preserved: {len(preserved)} pages")
+            list(executor.map(lambda p: delete_comments(client, p["id"]), preserved))
+
+        print(f"\nPages to preserve: {len(preserved)}")
+        print(f"Pages to delete: {len(to_delete)}")
+
+        # Delete only the roots of deleted subtrees; their descendants go with them
+        direct, covered = split_covered_pages(pages, to_delete, preserved)
+        deleted_count = delete_pages(client, direct, pages)
+
+        if covered:
+            # Descendants that survived (the delete didn't cascade) are deleted
+            # individually, children first
+            try:
+                remaining_ids = {p["id"] for p in get_all_pages(client, space_id, raise_on_error=True)}
+            except Exception as e:
+                print(f"  Could not list remaining pages: {e}")
+                remaining_ids = set()
+            # Preserved pages are never deleted, so a listing without them
+            # can't confirm anything; then delete every covered page
+            if not remaining_ids or not remaining_ids.issuperset(p["id"] for p in preserved):
+                remaining = covered
+            else:
+                remaining = [p for p in covered if p["id"] in remaining_ids]
+                deleted_count += len(covered) - len(remaining)
+            if remaining:
+                print(f"  {len(remaining)} child pages remain, deleting individually")
+                deleted_count += delete_pages(client, remaining, pages)
+
+        print("\nCleanup complete!")
+        print(f"  Deleted: {deleted_count} pages")
+        print(f"  Preserved: {len(preserved)} pages")
 
 
 def main():
@@ -10,25 +10,93 @@ Environment Variables:
     CONFLUENCE_EMAIL: Account email
     CONFLUENCE_API_TOKEN: API token
     DEMO_SPACE_KEY: Space key (default: CDEMO)
+    CONFLUENCE_HTTP2: Set to "true" to use HTTP/2 via httpx (default: off)
 """
 
+import importlib.util
 import os
+import random
 import sys
+import threading
 import time
 from functools import wraps
 
 import requests
+from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
 
+# Optional faster JSON decoding
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Optional HTTP/2 transport (pip install 'httpx[http2]'); httpx needs h2
+# installed for http2=True
+try:
+    import httpx
+    HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 # Retry configuration
 DEFAULT_MAX_RETRIES = 3
 DEFAULT_BASE_DELAY = 1.0  # seconds
 RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
 
+# Pooled connections per host; matches the concurrency of the scripts
+DEFAULT_POOL_SIZE = 16
+
+# Process-wide request rate, shared by all threads (Confluence Cloud limit)
+MAX_REQUESTS_PER_SECOND = 10
+
+# Transport errors worth retrying, for whichever HTTP clients are installed
+CONNECTION_ERRORS: tuple[type[Exception], ...] = (requests.exceptions.ConnectionError,)
+TIMEOUT_ERRORS: tuple[type[Exception], ...] = (requests.exceptions.Timeout,)
+if HTTP2_AVAILABLE:
+    CONNECTION_ERRORS += (httpx.NetworkError,)
+    TIMEOUT_ERRORS += (httpx.TimeoutException,)
+
+# Responses come from requests, or from httpx when HTTP/2 is enabled; both
+# expose status_code, content, text and json()
+if HTTP2_AVAILABLE:
+    Response = requests.Response | httpx.Response
+else:
+    Response = requests.Response
+
+
+class RateLimiter:
+    """Thread-safe limiter that spaces calls evenly at a maximum rate."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+
+    def acquire(self):
+        """Block until the caller may make its next request."""
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+_rate_limiter = RateLimiter(MAX_REQUESTS_PER_SECOND)
+
+
+def _backoff_delay(base_delay: float, attempt: int) -> float:
+    """Jittered exponential backoff so concurrent callers don't retry in lockstep."""
+    return random.uniform(base_delay, base_delay * 3 * (2 ** attempt))
+
 
 def retry_on_failure(max_retries: int = DEFAULT_MAX_RETRIES, base_delay: float = DEFAULT_BASE_DELAY):
     """
-    Decorator for retrying API calls with exponential backoff.
+    Decorator for retrying API calls with jittered exponential backoff.
+
+    Every attempt first waits its turn on the process-wide rate limiter.
 
     Handles:
     - 429 Too Many Requests (rate limiting)
@@ -37,7 +105,7 @@ def retry_on_failure(max_retries: int = DEFAULT_MAX_RETRIES, base_delay: float =
 
     Args:
         max_retries: Maximum number of retry attempts
-        base_delay: Initial delay between retries (doubles each attempt)
+        base_delay: Minimum delay between retries (the upper bound doubles each attempt)
     """
     def decorator(func):
         @wraps(func)
@@ -45,35 +113,36 @@ def retry_on_failure(max_retries: int = DEFAULT_MAX_RETRIES, base_delay: float =
             last_exception = None
             for attempt in range(max_retries + 1):
                 try:
+                    _rate_limiter.acquire()
                     response = func(*args, **kwargs)
                     if response.status_code not in RETRYABLE_STATUS_CODES:
                         return response
 
                     # Retryable status code
                     if attempt < max_retries:
-                        delay = base_delay * (2 ** attempt)
+                        delay = _backoff_delay(base_delay, attempt)
                         # Respect Retry-After header if present
                         if response.status_code == 429:
                             retry_after = response.headers.get("Retry-After")
                             if retry_after:
-                                delay = max(delay, float(retry_after))
+                                delay = float(retry_after)
                         print(f"  Retry {attempt + 1}/{max_retries} after {delay:.1f}s (status {response.status_code})")
                         time.sleep(delay)
                     else:
                         return response
 
-                except requests.exceptions.ConnectionError as e:
+                except CONNECTION_ERRORS as e:
                     last_exception = e
                     if attempt < max_retries:
-                        delay = base_delay * (2 ** attempt)
+                        delay = _backoff_delay(base_delay, attempt)
                         print(f"  Retry {attempt + 1}/{max_retries} after {delay:.1f}s (connection error)")
                         time.sleep(delay)
                     else:
                         raise
-                except requests.exceptions.Timeout as e:
+                except TIMEOUT_ERRORS as e:
                     last_exception = e
                     if attempt < max_retries:
-                        delay = base_delay * (2 ** attempt)
+                        delay = _backoff_delay(base_delay, attempt)
                         print(f"  Retry {attempt + 1}/{max_retries} after {delay:.1f}s (timeout)")
                         time.sleep(delay)
                     else:
@@ -88,6 +157,13 @@ def retry_on_failure(max_retries: int = DEFAULT_MAX_RETRIES, base_delay: float =
     return decorator
 
 
+def parse_json(response: Response):
+    """Decode a JSON response body, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(response.content)
+    return response.json()
+
+
 class ConfluenceConfig:
     """Configuration loaded from environment variables."""
 
@@ -96,6 +172,7 @@ class ConfluenceConfig:
         self.email = os.environ.get("CONFLUENCE_EMAIL", "")
         self.api_token = os.environ.get("CONFLUENCE_API_TOKEN", "")
         self.space_key = os.environ.get("DEMO_SPACE_KEY", "CDEMO")
+        self.http2 = os.environ.get("CONFLUENCE_HTTP2", "").lower() == "true"
 
     def validate(self) -> bool:
         """Validate required configuration is present."""
@@ -109,11 +186,50 @@ class ConfluenceConfig:
 
 
 class ConfluenceClient:
-    """Simple Confluence API client with common operations."""
+    """Simple Confluence API client with common operations.
 
-    def __init__(self, config: ConfluenceConfig | None = None):
+    Requests share one keep-alive connection pool, so only the first
+    request to the site pays for the TLS handshake. With http2 enabled (or
+    CONFLUENCE_HTTP2=true) and httpx[http2] installed, concurrent requests
+    are multiplexed over a single connection instead. The client can be
+    used from multiple threads.
+    """
+
+    def __init__(
+        self,
+        config: ConfluenceConfig | None = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        http2: bool | None = None,
+    ):
         self.config = config or ConfluenceConfig()
         self._auth = HTTPBasicAuth(self.config.email, self.config.api_token)
+        if http2 is None:
+            http2 = self.config.http2
+        if http2 and HTTP2_AVAILABLE:
+            self._session = httpx.Client(
+                http2=True,
+                auth=(self.config.email, self.config.api_token),
+                limits=httpx.Limits(max_connections=pool_size),
+                follow_redirects=True,  # match requests
+            )
+        else:
+            self._session = requests.Session()
+            self._session.auth = self._auth
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            self._session.mount("https://", adapter)
+            self._session.mount("http://", adapter)
+        # Spaces found by key; the key -> space mapping is stable for a run
+        self._space_cache: dict[str, dict] = {}
+
+    def close(self):
+        """Close the pooled connections."""
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
 
     @property
     def auth(self) -> HTTPBasicAuth:
@@ -121,34 +237,65 @@ class ConfluenceClient:
         return self._auth
 
     @retry_on_failure()
-    def get(self, endpoint: str, params: dict | None = None) -> requests.Response:
+    def get(self, endpoint: str, params: dict | None = None) -> Response:
         """Make GET request to Confluence API with automatic retry."""
         url = f"{self.config.site_url}{endpoint}"
-        return requests.get(url, auth=self.auth, params=params, timeout=30)
+        return self._session.get(url, params=params, timeout=30)
 
     @retry_on_failure()
-    def post(self, endpoint: str, json: dict | None = None) -> requests.Response:
+    def post(self, endpoint: str, json: dict | list | None = None) -> Response:
         """Make POST request to Confluence API with automatic retry."""
         url = f"{self.config.site_url}{endpoint}"
-        return requests.post(url, auth=self.auth, json=json, timeout=30)
+        return self._session.post(url, json=json, timeout=30)
 
     @retry_on_failure()
-    def delete(self, endpoint: str) -> requests.Response:
+    def delete(self, endpoint: str) -> Response:
         """Make DELETE request to Confluence API with automatic retry."""
         url = f"{self.config.site_url}{endpoint}"
-        return requests.delete(url, auth=self.auth, timeout=30)
+        return self._session.delete(url, timeout=30)
 
     def get_space(self, space_key: str | None = None) -> dict | None:
         """Get space by key. Returns space dict or None if not found."""
         key = space_key or self.config.space_key
+        if key in self._space_cache:
+            return self._space_cache[key]
+
         response = self.get("/wiki/api/v2/spaces", params={"keys": key})
 
         if response.status_code == 200:
-            data = response.json()
+            data = parse_json(response)
             if data.get("results"):
-                return data["results"][0]
+                space = data["results"][0]
+                self._space_cache[key] = space
+                return space
         return None
 
+    def try_create_space(self, payload: dict) -> tuple[bool, dict | None]:
+        """
+        Create a space, or fetch it if the key is already taken.
+
+        Returns (created, space); space is None if creation failed.
+        """
+        key = payload["key"]
+        response = self.post("/wiki/api/v2/spaces", json=payload)
+
+        if response.status_code == 200:
+            space = parse_json(response)
+            self._space_cache[key] = space
+            return True, space
+        if response.status_code == 409:
+            return False, self.get_space(key)
+        print(f"Failed to create space {key}: {response.status_code}")
+        print(response.text)
+        return False, None
+
+    def invalidate_space_cache(self, space_key: str | None = None):
+        """Forget cached spaces (one key, or all) so the next lookup refetches."""
+        if space_key is None:
+            self._space_cache.clear()
+        else:
+            self._space_cache.pop(space_key, None)
+
     def get_space_id(self, space_key: str | None = None) -> str | None:
         """Get space ID by key. Returns ID string or None if not found."""
         space = self.get_space(space_key)
@@ -15,8 +15,14 @@ Usage:
     subprocess.run(cmd)
 """
 
+import atexit
 import os
+import shlex
+import shutil
+import sys
+import tempfile
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -38,6 +44,14 @@ class PlatformConfig:
     mock_env_var: str
     scenarios_subdir: str
 
+    # Container paths derived from plugin_name
+    plugin_cache_dir: str = field(init=False)
+    plugin_dev_dir: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.plugin_cache_dir = f"/home/devuser/.claude/plugins/cache/{self.plugin_name}/{self.plugin_name}"
+        self.plugin_dev_dir = f"{self.plugin_cache_dir}/dev"
+
 
 PLATFORMS: dict[str, PlatformConfig] = {
     "confluence": PlatformConfig(
@@ -75,47 +89,96 @@ PLATFORMS: dict[str, PlatformConfig] = {
     ),
 }
 
-CROSS_PLATFORM_REQUIRED = ["confluence", "jira", "splunk"]
+CROSS_PLATFORM_REQUIRED = ("confluence", "jira", "splunk")
+
+# Platform credentials, read once at import
+_ENV_SNAPSHOT: dict[str, str] = {
+    var: os.environ.get(var, "") for config in PLATFORMS.values() for var in config.env_vars
+}
+
+DEFAULT_IMAGE = "as-demo-container:latest"
+
+_PROJECT_ROOT = Path(__file__).parent.parent
+
+# Claude credential files mounted into the container when present in secrets/
+CREDENTIAL_FILES = (".credentials.json", ".claude.json")
+
+# Built by scripts/build_base_image.py with libraries and symlinks preinstalled
+PREWARMED_IMAGE = "as-demo-container:prewarmed"
 
 
 # =============================================================================
 # Utility Functions
 # =============================================================================
 
+@lru_cache(maxsize=16)
 def get_skills_path(platform: str) -> Path:
-    """Get the skills repository path for a platform."""
+    """
+    Get the skills repository path for a platform.
+
+    Cached per platform; call get_skills_path.cache_clear() after changing
+    the environment at runtime.
+    """
     config = PLATFORMS.get(platform)
     if not config:
         raise ValueError(f"Unknown platform: {platform}")
     return Path(os.environ.get(config.skills_path_env, config.default_skills_path))
 
 
-def get_required_platforms(platform: str) -> list[str]:
-    """Get list of required platforms for a given platform mode."""
+@lru_cache(maxsize=16)
+def get_required_platforms(platform: str) -> tuple[str, ...]:
+    """Get the required platforms for a given platform mode.
+
+    Returns a tuple, since the cached result is shared by every caller.
+    """
     if platform in ("cross-platform", "all"):
         return CROSS_PLATFORM_REQUIRED
     if platform in PLATFORMS:
-        return [platform]
+        return (platform,)
     raise ValueError(f"Unknown platform: {platform}")
 
 
+@lru_cache(maxsize=32)
+def _dir_entries(path: Path) -> frozenset[str] | None:
+    """Get the entry names in a directory with one scandir, or None if it doesn't exist."""
+    try:
+        with os.scandir(path) as it:
+            return frozenset(entry.name for entry in it)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+@lru_cache(maxsize=16)
 def find_plugin_path(skills_path: Path, plugin_name: str) -> Path | None:
-    """Find the plugin directory within a skills repository."""
+    """Find the plugin directory within a skills repository (checked once per path)."""
     # Try plugins/<name> first
-    path = skills_path / "plugins" / plugin_name
-    if path.exists():
-        return path
+    if plugin_name in (_dir_entries(skills_path / "plugins") or ()):
+        return skills_path / "plugins" / plugin_name
     # Fall back to <name> in root
-    path = skills_path / plugin_name
-    if path.exists():
-        return path
+    root_entries = _dir_entries(skills_path) or frozenset()
+    if plugin_name in root_entries:
+        return skills_path / plugin_name
+    # The repository root may be the plugin itself
+    if ".claude-plugin" in root_entries or "skills" in root_entries:
+        return skills_path
     return None
 
 
+@lru_cache(maxsize=8)
+def find_credential_files(secrets_dir: Path) -> tuple[str, ...]:
+    """Get the credential files present in a secrets directory (checked once per directory)."""
+    return tuple(name for name in CREDENTIAL_FILES if (secrets_dir / name).exists())
+
+
+@lru_cache(maxsize=16)
 def find_lib_path(skills_path: Path, lib_name: str) -> Path | None:
-    """Find the library directory within a skills repository."""
-    path = skills_path / lib_name
-    return path if path.exists() else None
+    """Find the library directory within a skills repository (checked once per path)."""
+    if lib_name in (_dir_entries(skills_path) or ()):
+        return skills_path / lib_name
+    # Fall back to a sibling checkout next to the skills repository
+    if lib_name in (_dir_entries(skills_path.parent) or ()):
+        return skills_path.parent / lib_name
+    return None
 
 
 # =============================================================================
@@ -127,14 +190,16 @@ class DockerCommandBuilder:
     """Builder for Docker run commands with platform-specific configuration."""
 
     platform: str
-    image: str = "as-demo-container:latest"
-    project_root: Path = field(default_factory=lambda: Path(__file__).parent.parent)
+    image: str = DEFAULT_IMAGE
+    project_root: Path = _PROJECT_ROOT
 
     # Options
     remove: bool = True
     network: str | None = None
     workdir: str | None = None
     mock_mode: bool = False
+    prewarmed: bool = False  # Use PREWARMED_IMAGE and skip per-run setup
+    inherit_env: bool = False  # Pass credentials by name; docker reads them from its environment
 
     # Skills path overrides (platform -> path)
     skills_paths: dict[str, Path] = field(default_factory=dict)
@@ -143,28 +208,54 @@ class DockerCommandBuilder:
     extra_env_vars: dict[str, str] = field(default_factory=dict)
     extra_volumes: list[tuple[str, str, str]] = field(default_factory=list)  # (host, container, mode)
 
+    # Resolved once at construction so every build sees the same config
+    _required_platforms: tuple[str, ...] = field(init=False, repr=False)
+    _env_snapshot: dict[str, str] = field(init=False, repr=False)
+    _env_file: Path | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.prewarmed and self.image == DEFAULT_IMAGE:
+            self.image = PREWARMED_IMAGE
+        self._required_platforms = get_required_platforms(self.platform)
+        self._env_snapshot = {
+            var: _ENV_SNAPSHOT[var]
+            for p in self._required_platforms
+            for var in PLATFORMS[p].env_vars
+        }
+
     def _get_skills_path(self, platform: str) -> Path:
         """Get skills path with optional override."""
         if platform in self.skills_paths:
             return self.skills_paths[platform]
         return get_skills_path(platform)
 
-    def build_env_args(self) -> list[str]:
-        """Build environment variable arguments."""
-        args: list[str] = []
-        required_platforms = get_required_platforms(self.platform)
+    def _write_env_file(self) -> Path:
+        """
+        Write the platform credentials to a private env file for --env-file.
 
-        for p in required_platforms:
-            config = PLATFORMS[p]
+        Keeps secrets out of the docker argv (visible in ps). The file is
+        written once per builder and removed when the process exits.
+        """
+        if self._env_file is None:
+            fd, path = tempfile.mkstemp(prefix="as-env-")  # created with mode 0600
+            with os.fdopen(fd, "w") as f:
+                f.writelines(f"{var}={value}\n" for var, value in self._env_snapshot.items())
+            self._env_file = Path(path)
+            atexit.register(self._env_file.unlink, missing_ok=True)
+        return self._env_file
 
-            # Add platform env vars
-            for var in config.env_vars:
-                value = os.environ.get(var, "")
-                args.extend(["-e", f"{var}={value}"])
+    def build_env_args(self) -> list[str]:
+        """Build environment variable arguments."""
+        # Platform env vars
+        if self.inherit_env:
+            args = [arg for var in self._env_snapshot for arg in ("-e", var)]
+        else:
+            args = ["--env-file", str(self._write_env_file())]
 
-            # Add mock mode env var if enabled
-            if self.mock_mode:
-                args.extend(["-e", f"{config.mock_env_var}=true"])
+        # Add mock mode env vars if enabled
+        if self.mock_mode:
+            for p in self._required_platforms:
+                args.extend(["-e", f"{PLATFORMS[p].mock_env_var}=true"])
 
         # Add platform under test
         args.extend(["-e", f"SKILL_TEST_PLATFORM={self.platform}"])
@@ -178,25 +269,21 @@ class DockerCommandBuilder:
     def build_volume_args(self) -> list[str]:
         """Build volume mount arguments."""
         args: list[str] = []
-        required_platforms = get_required_platforms(self.platform)
 
         # Credential mounts
         secrets_dir = self.project_root / "secrets"
-        if (secrets_dir / ".credentials.json").exists():
-            args.extend(["-v", f"{secrets_dir}/.credentials.json:/home/devuser/.claude/.credentials.json:ro"])
-        if (secrets_dir / ".claude.json").exists():
-            args.extend(["-v", f"{secrets_dir}/.claude.json:/home/devuser/.claude/.claude.json:ro"])
+        for name in find_credential_files(secrets_dir):
+            args.extend(["-v", f"{secrets_dir}/{name}:/home/devuser/.claude/{name}:ro"])
 
         # Platform plugin and library mounts
-        for p in required_platforms:
+        for p in self._required_platforms:
             config = PLATFORMS[p]
             skills_path = self._get_skills_path(p)
 
             # Plugin mount
             plugin_path = find_plugin_path(skills_path, config.plugin_name)
             if plugin_path:
-                container_path = f"/home/devuser/.claude/plugins/cache/{config.plugin_name}/{config.plugin_name}/dev"
-                args.extend(["-v", f"{plugin_path}:{container_path}:ro"])
+                args.extend(["-v", f"{plugin_path}:{config.plugin_dev_dir}:ro"])
 
             # Library mount
             lib_path = find_lib_path(skills_path, config.lib_name)
@@ -215,33 +302,42 @@ class DockerCommandBuilder:
         return args
 
     def build_lib_install_command(self) -> str:
-        """Build command to install platform libraries in container."""
-        required_platforms = get_required_platforms(self.platform)
-        installs = []
-
-        for p in required_platforms:
-            config = PLATFORMS[p]
-            installs.append(f"pip install -q -e /opt/{config.lib_name} 2>/dev/null")
+        """Build command to install platform libraries in container.
 
-        return "; ".join(installs)
+        All libraries go through a single pip run. Their dependencies are
+        preinstalled in the image, so --no-deps skips resolution entirely.
+        Libraries that were not mounted are left out so the others still
+        install.
+        """
+        paths = " ".join(f"/opt/{PLATFORMS[p].lib_name}" for p in self._required_platforms)
+        editables = f'$(for d in {paths}; do [ -d "$d" ] && printf -- "-e %s " "$d"; done)'
+        return f"pip install -q --no-deps --disable-pip-version-check {editables} 2>/dev/null"
 
     def build_symlink_command(self) -> str:
         """Build command to set up plugin symlinks in container."""
-        required_platforms = get_required_platforms(self.platform)
         cmds = []
 
-        for p in required_platforms:
-            config = PLATFORMS[p]
-            plugin_cache = f"/home/devuser/.claude/plugins/cache/{config.plugin_name}/{config.plugin_name}"
+        for p in self._required_platforms:
+            plugin_cache = PLATFORMS[p].plugin_cache_dir
             cmds.append(f"rm -f {plugin_cache}/*[0-9]* 2>/dev/null; ln -sf dev {plugin_cache}/latest 2>/dev/null")
 
         return "; ".join(cmds)
 
+    def build_setup_command(self) -> str:
+        """Build the in-container setup that runs before the entrypoint."""
+        if self.prewarmed:
+            # Libraries and symlinks are already in the image
+            return "mkdir -p /tmp/checkpoints"
+        setup_cmd = self.build_lib_install_command()
+        symlink_cmd = self.build_symlink_command()
+        return f"{setup_cmd}; {symlink_cmd}; mkdir -p /tmp/checkpoints"
+
     def build_run_command(
         self,
         entrypoint: str | None = None,
         command: str | None = None,
         use_bash_wrapper: bool = True,
+        entrypoint_argv: list[str] | None = None,
     ) -> list[str]:
         """
         Build the complete docker run command.
@@ -250,6 +346,8 @@ class DockerCommandBuilder:
             entrypoint: Command to run in the container
             command: Alternative to entrypoint (passed after image)
             use_bash_wrapper: Wrap command in bash -c for lib installs
+            entrypoint_argv: Command to run as an argument list (exec form);
+                its arguments are never parsed by a shell
 
         Returns:
             List of command arguments for subprocess.run()
@@ -270,12 +368,16 @@ class DockerCommandBuilder:
         cmd.extend(self.build_volume_args())
 
         # Handle entrypoint/command
-        if use_bash_wrapper and entrypoint:
+        if entrypoint_argv and use_bash_wrapper and not self.prewarmed:
+            # Run setup, then exec the argv passed as positional parameters
+            inner_cmd = f'{self.build_setup_command()}; exec "$@"'
+            cmd.extend(["--entrypoint", "bash", self.image, "-c", inner_cmd, "bash", *entrypoint_argv])
+        elif entrypoint_argv:
+            # Exec form; a prewarmed image needs no setup
+            cmd.extend(["--entrypoint", entrypoint_argv[0], self.image, *entrypoint_argv[1:]])
+        elif use_bash_wrapper and entrypoint:
             # Wrap in bash -c with lib installs
-            setup_cmd = self.build_lib_install_command()
-            symlink_cmd = self.build_symlink_command()
-            inner_cmd = f"{setup_cmd}; {symlink_cmd}; mkdir -p /tmp/checkpoints; {entrypoint}"
-
+            inner_cmd = f"{self.build_setup_command()}; {entrypoint}"
             cmd.extend(["--entrypoint", "bash", self.image, "-c", inner_cmd])
         elif entrypoint:
             # Direct entrypoint
@@ -290,6 +392,34 @@ class DockerCommandBuilder:
 
         return cmd
 
+    def build_start_command(self, name: str) -> list[str]:
+        """
+        Build a docker run command for a long-lived container.
+
+        The container idles until removed with `docker rm -f {name}`; run
+        build_setup_command() in it once, then each test with
+        build_exec_command() to skip container startup and setup per run.
+        """
+        cmd = ["docker", "run", "-d", "--name", name]
+
+        if self.remove:
+            cmd.append("--rm")
+
+        if self.network:
+            cmd.extend(["--network", self.network])
+
+        if self.workdir:
+            cmd.extend(["-w", self.workdir])
+
+        cmd.extend(self.build_env_args())
+        cmd.extend(self.build_volume_args())
+        cmd.extend(["--entrypoint", "sleep", self.image, "infinity"])
+        return cmd
+
+    def build_exec_command(self, name: str, command: str) -> list[str]:
+        """Build a docker exec command running command in container name."""
+        return ["docker", "exec", name, "bash", "-c", command]
+
     def get_scenario_path(self, scenario: str) -> str:
         """Get the container path for a scenario file."""
         if self.platform in ("cross-platform", "all"):
@@ -315,6 +445,8 @@ def build_skill_test_command(
     fork_from: int | None = None,
     prompt_index: int | None = None,
     fix_context: str | None = None,
+    prewarmed: bool = False,
+    inherit_env: bool = False,
 ) -> list[str]:
     """
     Build a Docker command for running skill-test.py.
@@ -324,40 +456,85 @@ def build_skill_test_command(
     builder = DockerCommandBuilder(
         platform=platform,
         mock_mode=mock_mode,
+        prewarmed=prewarmed,
+        inherit_env=inherit_env,
     )
 
     scenario_path = builder.get_scenario_path(scenario)
 
     # Build skill-test.py command
-    test_cmd = f"python /workspace/skill-test.py {scenario_path}"
-    test_cmd += f" --model {model} --judge-model {judge_model}"
+    parts = [
+        "python", "/workspace/skill-test.py", scenario_path,
+        "--model", model, "--judge-model", judge_model,
+    ]
 
     if conversation:
-        test_cmd += " --conversation"
+        parts.append("--conversation")
     if fail_fast:
-        test_cmd += " --fail-fast"
+        parts.append("--fail-fast")
     if verbose:
-        test_cmd += " --verbose"
+        parts.append("--verbose")
     if mock_mode:
-        test_cmd += " --mock"
+        parts.append("--mock")
     if checkpoint_file:
-        test_cmd += f" --checkpoint-file {checkpoint_file}"
+        parts.extend(["--checkpoint-file", checkpoint_file])
     if fork_from is not None:
-        test_cmd += f" --fork-from {fork_from}"
+        parts.extend(["--fork-from", str(fork_from)])
     if prompt_index is not None:
-        test_cmd += f" --prompt-index {prompt_index}"
+        parts.extend(["--prompt-index", str(prompt_index)])
     if fix_context:
-        test_cmd += f" --fix-context {fix_context}"
+        parts.extend(["--fix-context", fix_context])
+
+    return builder.build_run_command(entrypoint_argv=parts)
+
 
-    return builder.build_run_command(entrypoint=test_cmd)
+@lru_cache(maxsize=1)
+def docker_executable() -> str:
+    """Resolve the docker binary on PATH once."""
+    path = shutil.which("docker")
+    if path is None:
+        raise FileNotFoundError("docker not found on PATH")
+    return path
+
+
+def run_docker(cmd: list[str], exec_after: bool = False) -> int:
+    """
+    Run a docker command built by DockerCommandBuilder.
+
+    With exec_after, the current process is replaced by docker, so signals
+    reach it directly and nothing runs afterwards (including atexit
+    handlers). Only use it for the last command, with a builder created
+    with inherit_env=True so no env file is left behind.
+
+    Returns the docker exit code (only when exec_after is False).
+    """
+    docker = docker_executable()
+    if exec_after:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.execv(docker, [docker, *cmd[1:]])
+
+    import subprocess
+    return subprocess.run([docker, *cmd[1:]]).returncode
 
 
 def validate_platform_setup(platform: str) -> dict[str, Any]:
     """
     Validate that a platform is properly configured.
 
+    Results are cached per platform and set of credentials present; call
+    clear_validation_cache() after changing the filesystem.
+
     Returns dict with validation results.
     """
+    env_present = frozenset(var for var in _ENV_SNAPSHOT if os.environ.get(var))
+    result = _validate_platform_setup(platform, env_present)
+    return {**result, "errors": list(result["errors"]), "warnings": list(result["warnings"])}
+
+
+@lru_cache(maxsize=32)
+def _validate_platform_setup(platform: str, env_present: frozenset[str]) -> dict[str, Any]:
+    """Validate a platform given the credential env vars that are set."""
     result: dict[str, Any] = {
         "platform": platform,
         "valid": True,
@@ -365,14 +542,13 @@ def validate_platform_setup(platform: str) -> dict[str, Any]:
         "warnings": [],
     }
 
-    required_platforms = get_required_platforms(platform)
+    configs = {p: PLATFORMS[p] for p in get_required_platforms(platform)}
 
-    for p in required_platforms:
-        config = PLATFORMS[p]
+    for p, config in configs.items():
         skills_path = get_skills_path(p)
 
-        # Check skills path exists
-        if not skills_path.exists():
+        # Check skills path exists (its listing is reused by the lookups below)
+        if _dir_entries(skills_path) is None:
             result["errors"].append(f"{p}: Skills path does not exist: {skills_path}")
             result["valid"] = False
             continue
@@ -390,12 +566,18 @@ def validate_platform_setup(platform: str) -> dict[str, Any]:
 
         # Check env vars
         for var in config.env_vars:
-            if not os.environ.get(var):
+            if var not in env_present:
                 result["warnings"].append(f"{p}: Environment variable {var} not set")
 
     return result
 
 
+def clear_validation_cache() -> None:
+    """Forget cached validation results and the directory lookups behind them."""
+    for cached in (_validate_platform_setup, find_plugin_path, find_lib_path, _dir_entries):
+        cached.cache_clear()
+
+
 # =============================================================================
 # CLI (for testing)
 # =============================================================================
@@ -408,6 +590,8 @@ if __name__ == "__main__":
     parser.add_argument("--validate", action="store_true", help="Validate platform setup")
     parser.add_argument("--show-command", action="store_true", help="Show example docker command")
     parser.add_argument("--scenario", default="test", help="Scenario name for example command")
+    parser.add_argument("--prewarmed", action="store_true", help=f"Use {PREWARMED_IMAGE} and skip setup")
+    parser.add_argument("--run", action="store_true", help="Run the skill test command (replaces this process)")
     args = parser.parse_args()
 
     if args.validate:
@@ -428,6 +612,16 @@ if __name__ == "__main__":
             platform=args.platform,
             scenario=args.scenario,
             verbose=True,
+            prewarmed=args.prewarmed,
         )
         print("\nDocker command:")
-        print(" ".join(cmd))
+        print(shlex.join(cmd))
+
+    if args.run:
+        cmd = build_skill_test_command(
+            platform=args.platform,
+            scenario=args.scenario,
+            prewarmed=args.prewarmed,
+            inherit_env=True,
+        )
+        run_docker(cmd, exec_after=True)
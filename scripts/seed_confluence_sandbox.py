@@ -19,12 +19,17 @@ Environment Variables:
 import json
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
-from confluence_base import ConfluenceClient, ConfluenceConfig, require_config
+from confluence_base import ConfluenceClient, ConfluenceConfig, parse_json, require_config
 
 # Additional configuration
 SPACE_NAME = os.environ.get("DEMO_SPACE_NAME", "Confluence Demo Space")
 
+# Concurrent page creations (kept within the client's connection pool)
+MAX_WORKERS = 8
+
 # Demo content configuration
 DEMO_PAGES = [
     {
@@ -74,6 +79,55 @@ DEMO_PAGES = [
 ]
 
 
+def _adf_heading(level):
+    """Build a handler for a heading paragraph of the given level."""
+    prefix_len = level + 1
+
+    def handler(para):
+        return {
+            "type": "heading",
+            "attrs": {"level": level},
+            "content": [{"type": "text", "text": para[prefix_len:]}]
+        }
+    return handler
+
+
+def _adf_code_block(para):
+    lines = para.split("\n")
+    code = "\n".join(lines[1:-1]) if len(lines) > 2 else ""
+    return {
+        "type": "codeBlock",
+        "attrs": {"language": "bash"},
+        "content": [{"type": "text", "text": code}]
+    }
+
+
+def _adf_bullet_list(para):
+    list_items = []
+    for item in para.split("\n"):
+        if item.startswith("- "):
+            list_items.append({
+                "type": "listItem",
+                "content": [{
+                    "type": "paragraph",
+                    "content": [{"type": "text", "text": item[2:]}]
+                }]
+            })
+    return {
+        "type": "bulletList",
+        "content": list_items
+    }
+
+
+# Block handlers keyed by paragraph prefix (3-character keys are checked first)
+_ADF_BLOCK_HANDLERS = {
+    "## ": _adf_heading(2),
+    "```": _adf_code_block,
+    "# ": _adf_heading(1),
+    "- ": _adf_bullet_list,
+}
+
+
 def markdown_to_adf(markdown_text):
     """Convert simple markdown to ADF format."""
     # Simple conversion - just create a paragraph with the text
@@ -82,42 +136,9 @@ def markdown_to_adf(markdown_text):
     content = []
 
     for para in paragraphs:
-        if para.startswith("# "):
-            content.append({
-                "type": "heading",
-                "attrs": {"level": 1},
-                "content": [{"type": "text", "text": para[2:]}]
-            })
-        elif para.startswith("## "):
-            content.append({
-                "type": "heading",
-                "attrs": {"level": 2},
-                "content": [{"type": "text", "text": para[3:]}]
-            })
-        elif para.startswith("```"):
-            lines = para.split("\n")
-            code = "\n".join(lines[1:-1]) if len(lines) > 2 else ""
-            content.append({
-                "type": "codeBlock",
-                "attrs": {"language": "bash"},
-                "content": [{"type": "text", "text": code}]
-            })
-        elif para.startswith("- "):
-            items = para.split("\n")
-            list_items = []
-            for item in items:
-                if item.startswith("- "):
-                    list_items.append({
-                        "type": "listItem",
-                        "content": [{
-                            "type": "paragraph",
-                            "content": [{"type": "text", "text": item[2:]}]
-                        }]
-                    })
-            content.append({
-                "type": "bulletList",
-                "content": list_items
-            })
+        handler = _ADF_BLOCK_HANDLERS.get(para[:3]) or _ADF_BLOCK_HANDLERS.get(para[:2])
+        if handler:
+            content.append(handler(para))
         elif para.strip():
             content.append({
                 "type": "paragraph",
@@ -131,9 +152,15 @@ def markdown_to_adf(markdown_text):
     }
 
 
-def create_space(client: ConfluenceClient, config: ConfluenceConfig):
-    """Create the demo space."""
-    payload = {
+@lru_cache(maxsize=128)
+def markdown_to_adf_json(markdown_text):
+    """Convert markdown to a serialized ADF document (cached per text)."""
+    return json.dumps(markdown_to_adf(markdown_text))
+
+
+def space_payload(config: ConfluenceConfig):
+    """Build the create request for the demo space."""
+    return {
         "key": config.space_key,
         "name": SPACE_NAME,
         "description": {
@@ -144,31 +171,16 @@ def create_space(client: ConfluenceClient, config: ConfluenceConfig):
         }
     }
 
-    response = client.post("/wiki/api/v2/spaces", json=payload)
-
-    if response.status_code == 200:
-        print(f"Created space: {config.space_key}")
-        return response.json()
-    elif response.status_code == 409:
-        print(f"Space {config.space_key} already exists")
-        return client.get_space()
-    else:
-        print(f"Failed to create space: {response.status_code}")
-        print(response.text)
-        return None
-
 
 def create_page(client: ConfluenceClient, space_id, title, body, parent_id=None, labels=None):
     """Create a page in the space."""
-    adf_body = markdown_to_adf(body)
-
     payload = {
         "spaceId": space_id,
         "status": "current",
         "title": title,
         "body": {
             "representation": "atlas_doc_format",
-            "value": json.dumps(adf_body)
+            "value": markdown_to_adf_json(body)
         }
     }
 
@@ -178,7 +190,7 @@ def create_page(client: ConfluenceClient, space_id, title, body, parent_id=None,
     response = client.post("/wiki/api/v2/pages", json=payload)
 
     if response.status_code == 200:
-        page = response.json()
+        page = parse_json(response)
         print(f"  Created page: {title} (ID: {page['id']})")
 
         # Add labels if specified
@@ -193,42 +205,63 @@ def create_page(client: ConfluenceClient, space_id, title, body, parent_id=None,
 
 
 def add_labels(client: ConfluenceClient, page_id, labels):
-    """Add labels to a page."""
-    for label in labels:
-        payload = {"name": label}
-        response = client.post(f"/wiki/api/v2/pages/{page_id}/labels", json=payload)
+    """Add labels to a page in one request, falling back to one request per label."""
+    payload = [{"prefix": "global", "name": label} for label in labels]
+    response = client.post(f"/wiki/rest/api/content/{page_id}/label", json=payload)
+
+    if response.status_code == 200:
+        print(f"    Added labels: {', '.join(labels)}")
+        return
 
-        if response.status_code == 200:
-            print(f"    Added label: {label}")
-        elif response.status_code != 400:  # 400 usually means label exists
-            print(f"    Failed to add label '{label}': {response.status_code}")
+    with ThreadPoolExecutor(max_workers=len(labels)) as executor:
+        list(executor.map(lambda label: add_label(client, page_id, label), labels))
+
+
+def add_label(client: ConfluenceClient, page_id, label):
+    """Add a single label to a page."""
+    payload = {"name": label}
+    response = client.post(f"/wiki/api/v2/pages/{page_id}/labels", json=payload)
+
+    if response.status_code == 200:
+        print(f"    Added label: {label}")
+    elif response.status_code != 400:  # 400 usually means label exists
+        print(f"    Failed to add label '{label}': {response.status_code}")
 
 
 def create_demo_content(client: ConfluenceClient, space_id):
     """Create all demo pages and content."""
     print("\nCreating demo content...")
 
-    for page_config in DEMO_PAGES:
-        # Create root page
-        page = create_page(
-            client,
-            space_id,
-            page_config["title"],
-            page_config["body"],
-            labels=page_config.get("labels")
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        # Create root pages
+        roots = executor.map(
+            lambda page_config: create_page(
+                client,
+                space_id,
+                page_config["title"],
+                page_config["body"],
+                labels=page_config.get("labels")
+            ),
+            DEMO_PAGES,
         )
 
-        if page and "children" in page_config:
-            # Create child pages
-            for child_config in page_config["children"]:
-                create_page(
-                    client,
-                    space_id,
-                    child_config["title"],
-                    child_config["body"],
-                    parent_id=page["id"],
-                    labels=child_config.get("labels")
-                )
+        # Create child pages as soon as their root exists
+        child_futures = []
+        for page_config, page in zip(DEMO_PAGES, roots):
+            if page and "children" in page_config:
+                for child_config in page_config["children"]:
+                    child_futures.append(executor.submit(
+                        create_page,
+                        client,
+                        space_id,
+                        child_config["title"],
+                        child_config["body"],
+                        parent_id=page["id"],
+                        labels=child_config.get("labels")
+                    ))
+
+        for future in child_futures:
+            future.result()
 
 
 def main():
@@ -238,28 +271,30 @@ def main():
 
     # Validate and get configuration
     config = require_config()
-    client = ConfluenceClient(config)
-
-    print(f"Site: {config.site_url}")
-    print(f"Space: {config.space_key} ({SPACE_NAME})")
+    with ConfluenceClient(config) as client:
+        print(f"Site: {config.site_url}")
+        print(f"Space: {config.space_key} ({SPACE_NAME})")
 
-    # Check if space exists
-    existing_space = client.get_space()
-    if existing_space:
-        print(f"\nSpace {config.space_key} already exists (ID: {existing_space['id']})")
-        space = existing_space
-    else:
-        # Create space
-        space = create_space(client, config)
+        # Check if space exists (a single GET when already seeded)
+        created = False
+        space = client.get_space()
         if not space:
-            print("Failed to create space")
-            sys.exit(1)
-
-    # Create demo content
-    create_demo_content(client, space["id"])
-
-    print("\nDemo data seeding complete!")
-    print(f"Visit: {config.site_url}/wiki/spaces/{config.space_key}")
+            # Create space; on a 409 conflict this fetches the existing one
+            created, space = client.try_create_space(space_payload(config))
+            if not space:
+                print("Failed to create space")
+                sys.exit(1)
+
+        if created:
+            print(f"\nCreated space: {config.space_key} (ID: {space['id']})")
+        else:
+            print(f"\nSpace {config.space_key} already exists (ID: {space['id']})")
+
+        # Create demo content
+        create_demo_content(client, space["id"])
+
+        print("\nDemo data seeding complete!")
+        print(f"Visit: {config.site_url}/wiki/spaces/{config.space_key}")
 
 
 if __name__ == "__main__":
@@ -12,11 +12,10 @@ Sends events to Splunk via HTTP Event Collector (HEC).
 """
 
 import os
-import random
 import signal
 import time
 
-from splunk_events import GENERATORS, HECClient
+from splunk_events import HECClient, generate_events
 
 # Configuration from environment
 EVENTS_PER_MINUTE = int(os.environ.get("EVENTS_PER_MINUTE", "60"))
@@ -65,19 +64,10 @@ def main():
 
     while running:
         # Generate batch of events
-        events = []
-        for _ in range(batch_size):
-            # Select generator based on weights
-            r = random.random()
-            cumulative = 0
-            for generator, weight in GENERATORS:
-                cumulative += weight
-                if r < cumulative:
-                    events.append(generator(anomaly_rate=ANOMALY_RATE))
-                    break
+        events = generate_events(batch_size, anomaly_rate=ANOMALY_RATE)
 
         # Send to HEC
-        if hec.send(events):
+        if hec.send(events, base_time=time.time()):
             event_count += len(events)
         else:
             error_count += 1
@@ -109,28 +109,31 @@ class TestRateCalculations:
 class TestMainLoop:
     """Tests for main loop behavior."""
 
+    @patch('generator.time.sleep')
     @patch('generator.hec')
-    @patch('generator.GENERATORS')
-    def test_generates_events_in_batches(self, mock_generators, mock_hec):
-        """Should generate events in batches."""
+    @patch('generator.generate_events')
+    def test_generates_events_in_batches(self, mock_generate_events, mock_hec, mock_sleep):
+        """Should generate and send one batch per loop iteration."""
         import generator
 
-        # Setup mock generator
-        mock_gen = MagicMock(return_value={"event": "test"})
-        mock_generators.__iter__ = MagicMock(return_value=iter([(mock_gen, 1.0)]))
-
+        events = [{"event": "test"}] * 5
+        mock_generate_events.return_value = events
         mock_hec.send.return_value = True
         mock_hec.wait_until_ready.return_value = True
 
-        # Run one iteration
-        generator.running = True
-        events = []
-        batch_size = 5
+        # Stop after one iteration
+        def stop(_interval):
+            generator.running = False
+        mock_sleep.side_effect = stop
 
-        for _ in range(batch_size):
-            events.append(mock_gen())
+        generator.running = True
+        with patch.object(generator, 'EVENTS_PER_MINUTE', 300):
+            generator.main()
 
-        assert len(events) == batch_size
+        mock_generate_events.assert_called_once_with(5, anomaly_rate=generator.ANOMALY_RATE)
+        mock_hec.send.assert_called_once()
+        assert mock_hec.send.call_args.args[0] is events
+        mock_sleep.assert_called_once_with(1.0)
 
     @patch('generator.hec')
     def test_counts_errors_on_send_failure(self, mock_hec):
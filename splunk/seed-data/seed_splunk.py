@@ -62,15 +62,16 @@ def seed_historical_data():
 
         print(f"\nSeeding day {day + 1}/{DAYS_TO_SEED}: {day_start.strftime('%Y-%m-%d')}")
 
-        # Generate timestamps for this day (distributed throughout the day)
+        # Generate timestamps for this day (distributed throughout the day),
+        # as epoch offsets from midnight rather than a datetime per event
+        midnight = day_start.replace(hour=0, minute=0, second=0).timestamp()
         timestamps = []
         for _ in range(EVENTS_PER_DAY):
             hour = random.gauss(14, 4)
             hour = max(0, min(23, int(hour)))
             minute = random.randint(0, 59)
             second = random.randint(0, 59)
-            ts = day_start.replace(hour=hour, minute=minute, second=second)
-            timestamps.append(ts.timestamp())
+            timestamps.append(midnight + hour * 3600 + minute * 60 + second)
 
         timestamps.sort()
 
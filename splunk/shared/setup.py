@@ -9,5 +9,6 @@ setup(
         'requests>=2.28.0',
         'faker>=18.0.0',
         'urllib3>=1.26.0',
+        'orjson>=3.8.0',
     ],
 )
@@ -6,24 +6,37 @@ Provides realistic log event generation for different personas and
 a simple HTTP Event Collector client.
 """
 
-import json
+import asyncio
+import itertools
 import os
 import random
 import time
 import urllib3
-from datetime import datetime
 
+import orjson
 import requests
 from faker import Faker
+from requests.adapters import HTTPAdapter
 
 # Disable SSL warnings for self-signed certs
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 fake = Faker()
 
+# FAST_FAKE=1 replaces the hottest Faker calls with plain random equivalents
+FAST_FAKE = os.environ.get("FAST_FAKE", "") == "1"
+
+
+# Top-level keys of an HEC event
+_HEC_FIELDS = frozenset(("event", "source", "sourcetype", "index", "host", "time"))
+
 
 class HECClient:
-    """HTTP Event Collector client for Splunk."""
+    """HTTP Event Collector client for Splunk.
+
+    Requests share one keep-alive connection, so only the first request
+    pays for the TLS handshake.
+    """
 
     def __init__(self, default_host="unknown", timeout=10):
         self.url = os.environ.get("SPLUNK_HEC_URL", "https://splunk:8088")
@@ -31,56 +44,106 @@ class HECClient:
         self.default_host = default_host
         self.timeout = timeout
         self._endpoint = f"{self.url}/services/collector/event"
+        self._session = requests.Session()
+        self._session.headers.update({
+            "Authorization": f"Splunk {self.token}",
+            "Content-Type": "application/json",
+        })
+        self._session.verify = False
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def _is_ready(self):
+        """Probe the HEC health endpoint once."""
+        try:
+            resp = self._session.get(
+                f"{self.url}/services/collector/health",
+                timeout=self.timeout
+            )
+        except requests.exceptions.RequestException:
+            return False
+        return resp.status_code in (200, 400)  # 400 means HEC is up but needs event
 
     def wait_until_ready(self, max_retries=60, retry_interval=5):
         """Wait for HEC endpoint to become available."""
         print(f"Waiting for HEC at {self.url}...")
         for i in range(max_retries):
-            try:
-                resp = requests.get(
-                    f"{self.url}/services/collector/health",
-                    headers={"Authorization": f"Splunk {self.token}"},
-                    verify=False,
-                    timeout=self.timeout
-                )
-                if resp.status_code in (200, 400):  # 400 means HEC is up but needs event
-                    print(f"HEC ready after {i * retry_interval}s")
-                    return True
-            except requests.exceptions.RequestException:
-                pass
+            if self._is_ready():
+                print(f"HEC ready after {i * retry_interval}s")
+                return True
             print(f"  Waiting... ({i + 1}/{max_retries})")
             time.sleep(retry_interval)
         print("HEC not available after maximum retries")
         return False
 
-    def send(self, events):
-        """Send events to HEC. Returns True on success."""
+    async def wait_until_ready_async(self, max_retries=60, retry_interval=5):
+        """
+        Wait for HEC endpoint to become available without blocking the event loop.
+
+        Lets callers overlap the wait with other startup work (e.g. with
+        asyncio.gather). Each probe runs in a worker thread.
+        """
+        print(f"Waiting for HEC at {self.url}...")
+        for i in range(max_retries):
+            if await asyncio.to_thread(self._is_ready):
+                print(f"HEC ready after {i * retry_interval}s")
+                return True
+            print(f"  Waiting... ({i + 1}/{max_retries})")
+            await asyncio.sleep(retry_interval)
+        print("HEC not available after maximum retries")
+        return False
+
+    def send(self, events, base_time=None):
+        """
+        Send events to HEC. Returns True on success.
+
+        Events without a "time" are stamped with base_time when given
+        (one clock read per batch); otherwise Splunk uses receipt time.
+        Events already in HEC shape (as the generators produce) are
+        serialized as-is, with missing fields spliced into the encoded
+        bytes; the caller's events are never modified.
+        """
         if not events:
             return True
 
         try:
             # Build payload - multiple events in single request
-            payload = ""
+            chunks = []
+            # Encoded ',"field":value' for each field an event may lack
+            fills = {
+                "source": b',"source":"as-demo"',
+                "sourcetype": b',"sourcetype":"_json"',
+                "index": b',"index":"main"',
+                "host": b',"host":' + orjson.dumps(self.default_host),
+            }
+            if base_time is not None:
+                fills["time"] = b',"time":' + orjson.dumps(base_time)
             for event in events:
-                hec_event = {
-                    "event": event.get("event", event),
-                    "source": event.get("source", "as-demo"),
-                    "sourcetype": event.get("sourcetype", "_json"),
-                    "index": event.get("index", "main"),
-                    "host": event.get("host", self.default_host),
-                }
-                if "time" in event:
-                    hec_event["time"] = event["time"]
-                payload += json.dumps(hec_event)
-
-            resp = requests.post(
+                if "event" in event and event.keys() <= _HEC_FIELDS:
+                    # Insert missing fields before the closing brace rather
+                    # than building a new dict per event
+                    raw = orjson.dumps(event)
+                    missing = [fill for field, fill in fills.items() if field not in event]
+                    chunks.append(raw[:-1] + b"".join(missing) + b"}" if missing else raw)
+                else:
+                    hec_event = {
+                        "event": event.get("event", event),
+                        "source": event.get("source", "as-demo"),
+                        "sourcetype": event.get("sourcetype", "_json"),
+                        "index": event.get("index", "main"),
+                        "host": event.get("host", self.default_host),
+                    }
+                    if "time" in event:
+                        hec_event["time"] = event["time"]
+                    elif base_time is not None:
+                        hec_event["time"] = base_time
+                    chunks.append(orjson.dumps(hec_event))
+            payload = b"".join(chunks)
+
+            resp = self._session.post(
                 self._endpoint,
                 data=payload,
-                headers={
-                    "Authorization": f"Splunk {self.token}",
-                    "Content-Type": "application/json",
-                },
-                verify=False,
                 timeout=self.timeout
             )
             return resp.status_code == 200
@@ -89,20 +152,50 @@ class HECClient:
             return False
 
 
+# Fake field helpers
+
+if FAST_FAKE:
+    _USER_NAMES = tuple(fake.user_name() for _ in range(200))
+
+    def _ipv4():
+        r = random.getrandbits(32)
+        return f"{r >> 24}.{(r >> 16) & 0xff}.{(r >> 8) & 0xff}.{r & 0xff}"
+
+    def _commit_sha():
+        return f"{random.getrandbits(32):08x}"
+
+    def _user_name():
+        return random.choice(_USER_NAMES)
+else:
+    _ipv4 = fake.ipv4
+    _user_name = fake.user_name
+
+    def _commit_sha():
+        return fake.sha1()[:8]
+
+
 # Event generators for different personas
+# timestamp is a Unix epoch float, e.g. from time.time(); with None, Splunk
+# uses the receipt time
+
+# Choice tables are module-level tuples so they aren't rebuilt per event.
+# Four-item tables are indexed with random.getrandbits(2), which is much
+# cheaper than random.choice and still uniform (keep them at four items).
+
+_DEVOPS_PIPELINES = ("api-service", "web-frontend", "data-processor", "auth-service", "notification-worker")
+_DEVOPS_STAGES = ("build", "test", "security-scan", "deploy-staging", "deploy-prod")
+_DEVOPS_FAILED_STATUSES = ("failed", "failed", "timeout")
+
 
 def generate_devops_event(timestamp=None, anomaly_rate=0.05):
     """Generate DevOps/CI-CD related events."""
     is_anomaly = random.random() < anomaly_rate
 
-    pipelines = ["api-service", "web-frontend", "data-processor", "auth-service", "notification-worker"]
-    stages = ["build", "test", "security-scan", "deploy-staging", "deploy-prod"]
-
-    pipeline = random.choice(pipelines)
-    stage = random.choice(stages)
+    pipeline = random.choice(_DEVOPS_PIPELINES)
+    stage = random.choice(_DEVOPS_STAGES)
 
     if is_anomaly:
-        status = random.choice(["failed", "failed", "timeout"])
+        status = random.choice(_DEVOPS_FAILED_STATUSES)
         duration = random.randint(300, 1800)
         message = random.choice([
             f"Pipeline {pipeline} failed at {stage}: dependency resolution error",
@@ -121,8 +214,8 @@ def generate_devops_event(timestamp=None, anomaly_rate=0.05):
             "status": status,
             "duration_seconds": duration,
             "message": message,
-            "commit": fake.sha1()[:8],
-            "author": fake.user_name(),
+            "commit": _commit_sha(),
+            "author": _user_name(),
         },
         "source": "cicd",
         "sourcetype": "cicd:pipeline",
@@ -133,15 +226,20 @@ def generate_devops_event(timestamp=None, anomaly_rate=0.05):
     return event
 
 
+_SRE_SERVICES = ("api-gateway", "user-service", "payment-service", "inventory-service", "search-service")
+_SRE_LEVELS_BAD = ("ERROR", "ERROR", "CRITICAL")
+_SRE_LEVELS_GOOD = ("INFO", "INFO", "INFO", "DEBUG", "WARN")
+_SRE_REGIONS = ("us-east-1", "us-west-2", "eu-west-1")
+
+
 def generate_sre_event(timestamp=None, anomaly_rate=0.05):
     """Generate SRE/application monitoring events."""
     is_anomaly = random.random() < anomaly_rate
 
-    services = ["api-gateway", "user-service", "payment-service", "inventory-service", "search-service"]
-    service = random.choice(services)
+    service = random.choice(_SRE_SERVICES)
 
     if is_anomaly:
-        level = random.choice(["ERROR", "ERROR", "CRITICAL"])
+        level = random.choice(_SRE_LEVELS_BAD)
         latency = random.randint(2000, 10000)
         error_rate = random.uniform(5, 25)
         message = random.choice([
@@ -152,7 +250,7 @@ def generate_sre_event(timestamp=None, anomaly_rate=0.05):
             f"Memory usage critical: 95%",
         ])
     else:
-        level = random.choice(["INFO", "INFO", "INFO", "DEBUG", "WARN"])
+        level = random.choice(_SRE_LEVELS_GOOD)
         latency = random.randint(10, 200)
         error_rate = random.uniform(0, 1)
         message = random.choice([
@@ -170,7 +268,7 @@ def generate_sre_event(timestamp=None, anomaly_rate=0.05):
             "error_rate": round(error_rate, 2),
             "message": message,
             "host": f"{service}-{random.randint(1,5)}",
-            "region": random.choice(["us-east-1", "us-west-2", "eu-west-1"]),
+            "region": random.choice(_SRE_REGIONS),
         },
         "source": "application",
         "sourcetype": "app:metrics",
@@ -181,24 +279,29 @@ def generate_sre_event(timestamp=None, anomaly_rate=0.05):
     return event
 
 
+_SUPPORT_ACTIONS = ("login", "search", "view_product", "add_to_cart", "checkout", "support_ticket")
+_SUPPORT_ANOMALY_MESSAGES = (
+    "User session timeout",
+    "Payment processing failed",
+    "Feature unavailable due to service outage",
+    "Rate limit exceeded for user",
+)
+_SUPPORT_BROWSERS = ("Chrome", "Firefox", "Safari", "Edge")
+_SUPPORT_PLATFORMS = ("Windows", "macOS", "iOS", "Android")
+
+
 def generate_support_event(timestamp=None, anomaly_rate=0.05):
     """Generate support/user activity events."""
     is_anomaly = random.random() < anomaly_rate
 
-    actions = ["login", "search", "view_product", "add_to_cart", "checkout", "support_ticket"]
-    action = random.choice(actions)
+    action = random.choice(_SUPPORT_ACTIONS)
 
     user_id = fake.uuid4()[:8]
 
     if is_anomaly:
         status = "error"
         response_time = random.randint(5000, 15000)
-        message = random.choice([
-            f"User session timeout",
-            f"Payment processing failed",
-            f"Feature unavailable due to service outage",
-            f"Rate limit exceeded for user",
-        ])
+        message = _SUPPORT_ANOMALY_MESSAGES[random.getrandbits(2)]
     else:
         status = "success"
         response_time = random.randint(100, 1500)
@@ -211,8 +314,8 @@ def generate_support_event(timestamp=None, anomaly_rate=0.05):
             "status": status,
             "response_time_ms": response_time,
             "message": message,
-            "browser": random.choice(["Chrome", "Firefox", "Safari", "Edge"]),
-            "platform": random.choice(["Windows", "macOS", "iOS", "Android"]),
+            "browser": _SUPPORT_BROWSERS[random.getrandbits(2)],
+            "platform": _SUPPORT_PLATFORMS[random.getrandbits(2)],
         },
         "source": "user_activity",
         "sourcetype": "user:activity",
@@ -223,26 +326,31 @@ def generate_support_event(timestamp=None, anomaly_rate=0.05):
     return event
 
 
+_SECURITY_ANOMALY_TYPES = (
+    "failed_login",
+    "suspicious_activity",
+    "blocked_request",
+    "privilege_escalation_attempt",
+)
+_SECURITY_SEVERITIES = ("high", "high", "critical")
+_SECURITY_NORMAL_TYPES = ("login_success", "password_change", "api_access", "audit_log")
+
+
 def generate_security_event(timestamp=None, anomaly_rate=0.05):
     """Generate security/audit events."""
     is_anomaly = random.random() < anomaly_rate
 
     if is_anomaly:
-        event_type = random.choice([
-            "failed_login",
-            "suspicious_activity",
-            "blocked_request",
-            "privilege_escalation_attempt"
-        ])
-        severity = random.choice(["high", "high", "critical"])
+        event_type = _SECURITY_ANOMALY_TYPES[random.getrandbits(2)]
+        severity = random.choice(_SECURITY_SEVERITIES)
         message = random.choice([
-            f"Multiple failed login attempts from {fake.ipv4()}",
+            f"Multiple failed login attempts from {_ipv4()}",
             f"Suspicious API access pattern detected",
             f"Blocked SQL injection attempt",
             f"Unauthorized access attempt to admin endpoint",
         ])
     else:
-        event_type = random.choice(["login_success", "password_change", "api_access", "audit_log"])
+        event_type = _SECURITY_NORMAL_TYPES[random.getrandbits(2)]
         severity = "info"
         message = f"Normal security event: {event_type}"
 
@@ -250,8 +358,8 @@ def generate_security_event(timestamp=None, anomaly_rate=0.05):
         "event": {
             "event_type": event_type,
             "severity": severity,
-            "source_ip": fake.ipv4(),
-            "user": fake.user_name() if random.random() > 0.3 else None,
+            "source_ip": _ipv4(),
+            "user": _user_name() if random.random() > 0.3 else None,
             "message": message,
             "geo": {
                 "country": fake.country_code(),
@@ -267,12 +375,14 @@ def generate_security_event(timestamp=None, anomaly_rate=0.05):
     return event
 
 
+_INFRA_HOSTS = tuple(f"srv-{i:03d}" for i in range(1, 20))
+
+
 def generate_infrastructure_event(timestamp=None, anomaly_rate=0.05):
     """Generate infrastructure/system events."""
     is_anomaly = random.random() < anomaly_rate
 
-    hosts = [f"srv-{i:03d}" for i in range(1, 20)]
-    host = random.choice(hosts)
+    host = random.choice(_INFRA_HOSTS)
 
     if is_anomaly:
         cpu = random.randint(85, 100)
@@ -321,13 +431,18 @@ GENERATORS = [
 ]
 
 
+# Generator functions and cumulative weights, for random.choices
+_GEN_FUNCS = [generator for generator, _ in GENERATORS]
+_CUM_WEIGHTS = list(itertools.accumulate(weight for _, weight in GENERATORS))
+
+
 def generate_event(timestamp=None, anomaly_rate=0.05):
     """Generate a random event based on weighted distribution."""
-    r = random.random()
-    cumulative = 0
-    for generator, weight in GENERATORS:
-        cumulative += weight
-        if r < cumulative:
-            return generator(timestamp=timestamp, anomaly_rate=anomaly_rate)
-    # Fallback
-    return generate_sre_event(timestamp=timestamp, anomaly_rate=anomaly_rate)
+    generator = random.choices(_GEN_FUNCS, cum_weights=_CUM_WEIGHTS)[0]
+    return generator(timestamp=timestamp, anomaly_rate=anomaly_rate)
+
+
+def generate_events(n, timestamp=None, anomaly_rate=0.05):
+    """Generate n random events, drawing all generator picks in one call."""
+    generators = random.choices(_GEN_FUNCS, cum_weights=_CUM_WEIGHTS, k=n)
+    return [generator(timestamp=timestamp, anomaly_rate=anomaly_rate) for generator in generators]
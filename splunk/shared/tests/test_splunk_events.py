@@ -0,0 +1,87 @@
+"""Tests for shared/splunk_events.py."""
+
+import copy
+import json
+from unittest.mock import MagicMock
+
+import splunk_events
+
+
+class TestGenerateEvents:
+    """Tests for bulk event generation."""
+
+    def test_generates_requested_count(self):
+        """Should return exactly n events."""
+        for n in (0, 1, 50):
+            assert len(splunk_events.generate_events(n)) == n
+
+    def test_events_are_hec_shaped(self):
+        """Every event should carry the HEC envelope fields."""
+        for event in splunk_events.generate_events(100):
+            assert isinstance(event["event"], dict)
+            assert event["source"]
+            assert event["sourcetype"]
+            assert event["index"]
+
+    def test_no_time_without_timestamp(self):
+        """Events should leave time unset when no timestamp is given."""
+        for event in splunk_events.generate_events(20):
+            assert "time" not in event
+
+    def test_passes_timestamp_through(self):
+        """Every event should carry the given timestamp."""
+        events = splunk_events.generate_events(20, timestamp=1700000000.0)
+        assert all(event["time"] == 1700000000.0 for event in events)
+
+    def test_passes_anomaly_rate_through(self):
+        """Anomaly rate 1 should make every event anomalous, 0 none."""
+        anomalous = splunk_events.generate_events(200, anomaly_rate=1.0)
+        normal = splunk_events.generate_events(200, anomaly_rate=0.0)
+
+        devops = [e for e in anomalous if e["sourcetype"] == "cicd:pipeline"]
+        sre = [e for e in anomalous if e["sourcetype"] == "app:metrics"]
+        assert devops and sre
+        assert all(e["event"]["status"] != "success" for e in devops)
+        assert all(e["event"]["level"] in ("ERROR", "CRITICAL") for e in sre)
+
+        devops = [e for e in normal if e["sourcetype"] == "cicd:pipeline"]
+        sre = [e for e in normal if e["sourcetype"] == "app:metrics"]
+        assert devops and sre
+        assert all(e["event"]["status"] == "success" for e in devops)
+        assert all(e["event"]["level"] not in ("ERROR", "CRITICAL") for e in sre)
+
+    def test_draws_every_generator(self):
+        """A large batch should include events from every persona."""
+        sourcetypes = {e["sourcetype"] for e in splunk_events.generate_events(1000)}
+        assert sourcetypes == {
+            "cicd:pipeline", "app:metrics", "user:activity",
+            "security:audit", "infra:metrics",
+        }
+
+
+class TestHECClientSend:
+    """Tests for HECClient.send."""
+
+    def _client(self):
+        client = splunk_events.HECClient(default_host="test-host")
+        client._session = MagicMock()
+        client._session.post.return_value.status_code = 200
+        return client
+
+    def _sent_events(self, client):
+        payload = client._session.post.call_args.kwargs["data"].decode()
+        return [json.loads(line) for line in payload.replace("}{", "}\n{").splitlines()]
+
+    def test_does_not_modify_events(self):
+        """Defaults and base_time should not be written into the caller's events."""
+        client = self._client()
+        events = splunk_events.generate_events(10) + [{"event": {"a": 1}}]
+        original = copy.deepcopy(events)
+
+        assert client.send(events, base_time=1700000000.0)
+
+        assert events == original
+        sent = self._sent_events(client)
+        assert all(e["time"] == 1700000000.0 for e in sent)
+        assert sent[-1]["host"] == "test-host"
+        assert sent[-1]["source"] == "as-demo"